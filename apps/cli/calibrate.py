@@ -8,6 +8,8 @@ You can access this script from your CLI by running:
 """
 import click
 
+from autumn.calibration import run_calibration_chains
+
 from apps.covid_19 import calibration as covid_calibration
 from apps.marshall_islands import calibration as rmi_calibration
 from apps.mongolia import calibration as mongolia_calibration
@@ -26,25 +28,52 @@ for region in covid_calibration.CALIBRATIONS.keys():
     @click.argument("max_seconds", type=int)
     @click.argument("run_id", type=int)
     @click.option("--num-chains", type=int, default=1)
-    def run_region_calibration(max_seconds, run_id, num_chains, region=region):
+    @click.option(
+        "--all-chains",
+        is_flag=True,
+        help="Run chains 0 to num-chains - 1 locally, in parallel processes.",
+    )
+    def run_region_calibration(max_seconds, run_id, num_chains, all_chains, region=region):
         """Run COVID model calibration for region"""
         calib_func = covid_calibration.get_calibration_func(region)
-        calib_func(max_seconds, run_id, num_chains)
+        run_chains(calib_func, max_seconds, run_id, num_chains, all_chains)
 
 
 @calibrate.command("mongolia")
 @click.argument("max_seconds", type=int)
 @click.argument("run_id", type=int)
 @click.option("--num-chains", type=int, default=1)
-def mongolia_calibration(max_seconds, run_id, num_chains):
+@click.option(
+    "--all-chains",
+    is_flag=True,
+    help="Run chains 0 to num-chains - 1 locally, in parallel processes.",
+)
+def run_mongolia_calibration(max_seconds, run_id, num_chains, all_chains):
     """Run Mongolia TB model calibration."""
-    mongolia_calibration.run_calibration_chain(max_seconds, run_id, num_chains)
+    run_chains(
+        mongolia_calibration.run_calibration_chain, max_seconds, run_id, num_chains, all_chains
+    )
 
 
 @calibrate.command("rmi")
 @click.argument("max_seconds", type=int)
 @click.argument("run_id", type=int)
 @click.option("--num-chains", type=int, default=1)
-def rmi_calibration(max_seconds, run_id, num_chains):
+@click.option(
+    "--all-chains",
+    is_flag=True,
+    help="Run chains 0 to num-chains - 1 locally, in parallel processes.",
+)
+def run_rmi_calibration(max_seconds, run_id, num_chains, all_chains):
     """Run Marshall Islands TB model calibration."""
-    rmi_calibration.run_calibration_chain(max_seconds, run_id, num_chains)
+    run_chains(rmi_calibration.run_calibration_chain, max_seconds, run_id, num_chains, all_chains)
+
+
+def run_chains(calib_func, max_seconds, run_id, num_chains, all_chains):
+    """
+    Run the single chain run_id, or all of the chains if requested.
+    """
+    if all_chains:
+        run_calibration_chains(calib_func, max_seconds, num_chains)
+    else:
+        calib_func(max_seconds, run_id, num_chains)
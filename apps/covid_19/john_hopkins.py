@@ -53,11 +53,9 @@ def read_john_hopkins_data_from_csv(variable="confirmed", country="Australia"):
     if data["Province/State"].isnull().any():  # when there is a single row for the whole country
         data = data[data["Province/State"].isnull()]
 
-    data_series = []
-    for (columnName, columnData) in data.iteritems():
-        if columnName.count("/") > 1:
-            cumul_this_day = sum(columnData.values)
-            data_series.append(cumul_this_day)
+    # Sum the date columns over the country's rows
+    date_columns = [column for column in data.columns if column.count("/") > 1]
+    data_series = data[date_columns].sum(axis=0, skipna=False).to_numpy()
 
     # for confirmed and deaths, we want the daily counts and not the cumulative number
     if variable != "recovered":
@@ -1,7 +1,12 @@
 import os
 import copy
+import multiprocessing
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 
 import yaml
+import numpy as np
 import pandas as pd
 
 from autumn.model_runner import build_model_runner
@@ -25,19 +30,36 @@ phase_2_end = [PHASE_2_START_TIME + opti_params['configurations'][i]['phase_two_
                i in opti_params['configurations'].keys()]
 
 
+# The optimisation parameters only depend on the country and the calibrated parameter set, not on the decision
+# variables, so they are built once for each of these and copied for every evaluation of the objective function.
+_base_params_cache = {}
+
+
+def get_base_params(country, calibrated_params):
+    """
+    Return the model builder for the country and a copy of its parameters, updated with the optimisation default
+    config and the calibrated parameters.
+    """
+    key = (country, tuple(sorted(calibrated_params.items())))
+    if key not in _base_params_cache:
+        running_model = RegionApp(country)
+        params = running_model.params
+        # update params with optimisation default config
+        params["default"].update(copy.deepcopy(opti_params["default"]))
+        # update params with calibrated parameters
+        params["default"] = update_params(params['default'], calibrated_params)
+        _base_params_cache[key] = (running_model.build_model, params)
+
+    build_model, params = _base_params_cache[key]
+    return build_model, copy.deepcopy(params)
+
+
 def run_root_model(country=Region.UNITED_KINGDOM, calibrated_params={}):
     """
     This function runs a model to simulate the past epidemic (up until 1/7/2020) using a given calibrated parameter set.
     Returns an integrated model for the past epidemic.
     """
-    running_model = RegionApp(country)
-    build_model = running_model.build_model
-
-    params = copy.deepcopy(running_model.params)
-    # update params with optimisation default config
-    params["default"].update(opti_params["default"])
-    # update params with calibrated parameters
-    params["default"] = update_params(params['default'], calibrated_params)
+    build_model, params = get_base_params(country, calibrated_params)
 
     # prepare importation rates for herd immunity testing
     params["default"]["data"] = {
@@ -54,20 +76,31 @@ def run_root_model(country=Region.UNITED_KINGDOM, calibrated_params={}):
     return scenario_0.model
 
 
-def build_params_for_phases_2_and_3(decision_variables, config=0, mode='by_age'):
-    # create parameters for scenario 1 which includes Phases 2 and 3
+@lru_cache(maxsize=None)
+def get_phase_dates(config):
+    """
+    The phase dates only depend on the configuration, so are found once rather than for every set of decision variables
+    :return: the last day of Phase 1, the first and last days of Phase 2 and the first day of Phase 3
+    """
     ref_date = date(2019, 12, 31)
     phase_2_first_day = ref_date + timedelta(days=PHASE_2_START_TIME)
     phase_1_end_date = phase_2_first_day + timedelta(days=-1)
     phase_2_end_date = ref_date + timedelta(days=phase_2_end[config])
     phase_3_first_day = phase_2_end_date + timedelta(days=1)
+    return phase_1_end_date, phase_2_first_day, phase_2_end_date, phase_3_first_day
+
+
+def build_params_for_phases_2_and_3(decision_variables, config=0, mode='by_age'):
+    # create parameters for scenario 1 which includes Phases 2 and 3
+    phase_1_end_date, phase_2_first_day, phase_2_end_date, phase_3_first_day = get_phase_dates(config)
 
     sc_1_params = {}
     if mode == "by_age":
+        age_mixing_times = [phase_1_end_date, phase_2_first_day, phase_2_end_date, phase_3_first_day]
         age_mixing_update = {}
         for age_group in range(16):
             age_mixing_update["age_" + str(age_group)] = {
-                'times': [phase_1_end_date, phase_2_first_day, phase_2_end_date, phase_3_first_day],
+                'times': list(age_mixing_times),
                 'values': [1.0, decision_variables[age_group], decision_variables[age_group], 1.0]
             }
         sc_1_params["mixing_age_adjust"] = age_mixing_update
@@ -110,9 +143,41 @@ def has_immunity_been_reached(_model, phase_2_end_index):
     :return: a boolean
     """
     # validate herd immunity if incidence always decreases after 2 weeks in phase 3
-    time_indices = range(phase_2_end_index, len(_model.derived_outputs["times"]))
-    incidence_vals = [_model.derived_outputs['incidence'][i] for i in time_indices[14:]]
-    return max(incidence_vals) == incidence_vals[0]
+    incidence_vals = np.asarray(
+        _model.derived_outputs["incidence"][phase_2_end_index + 14 :], dtype=np.float64
+    )
+    return incidence_vals.max() == incidence_vals[0]
+
+
+# Optimisers often evaluate the objective function at the same decision variables more than once (e.g. during line
+# searches), so the results of the most recent evaluations are kept. Only the four scalar results are stored, keyed on
+# the root model's id, with a weak reference to check that the root model is still the one they were run from.
+OBJECTIVE_CACHE_SIZE = 16
+_objective_cache = OrderedDict()
+
+
+def get_objective_values(decision_variables, root_model, mode="by_age", country=Region.UNITED_KINGDOM, config=0,
+                         calibrated_params={}):
+    """
+    Evaluate the objective function, reusing the results of a recent evaluation with the same arguments.
+    See objective_function for the parameters, which also returns the models when they are needed.
+    :return: herd_immunity, total_nb_deaths, years_of_life_lost, prop_immune
+    """
+    cache_key = (
+        id(root_model), tuple(decision_variables), mode, country, config,
+        tuple(sorted(calibrated_params.items())),
+    )
+    cached_evaluation = _objective_cache.get(cache_key)
+    if cached_evaluation is not None and cached_evaluation[0]() is root_model:
+        _objective_cache.move_to_end(cache_key)
+        return cached_evaluation[1]
+
+    evaluation = objective_function(decision_variables, root_model, mode, country, config, calibrated_params)[:4]
+    _objective_cache[cache_key] = (weakref.ref(root_model), evaluation)
+    if len(_objective_cache) > OBJECTIVE_CACHE_SIZE:
+        _objective_cache.popitem(last=False)
+
+    return evaluation
 
 
 def objective_function(decision_variables, root_model, mode="by_age", country=Region.UNITED_KINGDOM, config=0,
@@ -127,9 +192,7 @@ def objective_function(decision_variables, root_model, mode="by_age", country=Re
     :param config: the id of the configuration being considered
     :param calibrated_params: a dictionary containing a set of calibrated parameters
     """
-    running_model = RegionApp(country)
-    build_model = running_model.build_model
-    params = copy.deepcopy(running_model.params)
+    build_model, params = get_base_params(country, calibrated_params)
 
     # reformat decision vars if locations
     if mode == "by_location":
@@ -143,9 +206,6 @@ def objective_function(decision_variables, root_model, mode="by_age", country=Re
     # Define scenario-1-specific params
     sc_1_params_update = build_params_for_phases_2_and_3(decision_variables, config, mode)
 
-    # Rebuild the default parameters
-    params["default"].update(opti_params["default"])
-    params["default"] = update_params(params['default'], calibrated_params)
     params['scenario_start_time'] = PHASE_2_START_TIME - 1
 
     # Create scenario 1
@@ -159,20 +219,23 @@ def objective_function(decision_variables, root_model, mode="by_age", country=Re
 
     #____________________________       Perform diagnostics         ______________________
     # How many deaths and years of life lost during Phase 2 and 3
-    start_phase2_index = models[1].derived_outputs["times"].index(PHASE_2_START_TIME)
-    end_phase2_index = models[1].derived_outputs["times"].index(phase_2_end[config])
-    total_nb_deaths = sum(models[1].derived_outputs["infection_deathsXall"][start_phase2_index:])
-    years_of_life_lost = sum(models[1].derived_outputs["years_of_life_lost"][start_phase2_index:])
+    # The derived output times are sorted, so find both phase boundaries with one binary search
+    derived_outputs = models[1].derived_outputs
+    output_times = np.asarray(derived_outputs["times"], dtype=np.float64)
+    phase_times = [PHASE_2_START_TIME, phase_2_end[config]]
+    start_phase2_index, end_phase2_index = np.searchsorted(output_times, phase_times)
+    found_times = output_times.take([start_phase2_index, end_phase2_index], mode="clip")
+    if not np.array_equal(found_times, phase_times):
+        raise ValueError("Phase 2 start and end times are not model output times")
+    total_nb_deaths = np.sum(derived_outputs["infection_deathsXall"][start_phase2_index:])
+    years_of_life_lost = np.sum(derived_outputs["years_of_life_lost"][start_phase2_index:])
 
     # What proportion immune at end of Phase 2
+    end_phase2_values = models[1].outputs[end_phase2_index, :]
     recovered_indices = [
-        i
-        for i in range(len(models[1].compartment_names))
-        if "recovered" in models[1].compartment_names[i]
+        i for i, name in enumerate(models[1].compartment_names) if "recovered" in name
     ]
-    nb_reco = sum([models[1].outputs[end_phase2_index, i] for i in recovered_indices])
-    total_pop = sum([models[1].outputs[end_phase2_index, i] for i in range(len(models[1].compartment_names))])
-    prop_immune = nb_reco / total_pop
+    prop_immune = end_phase2_values[recovered_indices].sum() / end_phase2_values.sum()
 
     # Has herd immunity been reached?
     herd_immunity = has_immunity_been_reached(models[1], end_phase2_index)
@@ -180,6 +243,33 @@ def objective_function(decision_variables, root_model, mode="by_age", country=Re
     return herd_immunity, total_nb_deaths, years_of_life_lost, prop_immune, models
 
 
+def evaluate_param_sets(decision_variables, param_set_list, mode="by_age", country=Region.UNITED_KINGDOM, config=0,
+                        num_workers=None):
+    """
+    Evaluate the objective function at the same decision variables for each calibrated parameter set.
+    Each parameter set needs its own root model, so the parameter sets are independent and are evaluated in separate
+    worker processes when more than one worker is available (defaults to one per CPU).
+    The models hold functions that cannot be sent back from the workers, so they are not returned.
+    :return: a list of (herd_immunity, total_nb_deaths, years_of_life_lost, prop_immune), one for each parameter set
+    """
+    evaluate_args = [(decision_variables, mode, country, config, param_set) for param_set in param_set_list]
+    num_workers = min(num_workers or os.cpu_count(), len(param_set_list))
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if num_workers < 2 or not can_fork:
+        return [_evaluate_param_set(*args) for args in evaluate_args]
+
+    with multiprocessing.get_context("fork").Pool(processes=num_workers) as pool:
+        return pool.starmap(_evaluate_param_set, evaluate_args, chunksize=1)
+
+
+def _evaluate_param_set(decision_variables, mode, country, config, calibrated_params):
+    # The root model is the initialisation step for each parameter set, run once before optimisation
+    root_model = run_root_model(country, calibrated_params)
+
+    # This is the evaluation to be run again and again during optimisation
+    return get_objective_values(decision_variables, root_model, mode, country, config, calibrated_params)
+
+
 def read_list_of_param_sets_from_csv(country):
     """
     Read a csv file containing the MCMC outputs and return a list of calibrated parameter sets. Each parameter set is
@@ -210,8 +300,7 @@ def read_list_of_param_sets_from_csv(country):
 
 
 def run_all_phases(decision_variables, country=Region.UNITED_KINGDOM, config=0, calibrated_params={}, mode="by_age"):
-    running_model = RegionApp(country)
-    build_model = running_model.build_model
+    build_model, params = get_base_params(country, calibrated_params)
 
     if mode == "by_location":
         new_decision_variables = {
@@ -221,12 +310,6 @@ def run_all_phases(decision_variables, country=Region.UNITED_KINGDOM, config=0,
         }
         decision_variables = new_decision_variables
 
-    params = copy.deepcopy(running_model.params)
-    # update params with optimisation default config
-    params["default"].update(opti_params["default"])
-    # update params with calibrated parameters
-    params["default"] = update_params(params['default'], calibrated_params)
-
     # prepare importation rates for herd immunity testing
     params["default"]["data"] = {
         'times_imported_cases': [0],
@@ -264,17 +347,13 @@ if __name__ == "__main__":
             for _config in [2, 3]:
                 param_set_list = read_list_of_param_sets_from_csv(_country)
                 # param_set_list = [param_set_list[-1]]
-                for param_set in param_set_list:
-                    # Run this line of code every time we use a new param_set and before performing optimisation
-                    # This is an initialisation step
-                    _root_model = run_root_model(_country, param_set)
-
-                    # The following line is the one to be run again and again during optimisation
-                    h, d, yoll, p_immune, m = objective_function(decision_vars[_mode], _root_model, _mode, _country, _config,
-                                                           param_set)
+                # Each parameter set is initialised with its own root model, so the parameter sets are run in parallel
+                evaluations = evaluate_param_sets(decision_vars[_mode], param_set_list, _mode, _country, _config)
+                for h, d, yoll, p_immune in evaluations:
                     print("Immunity: " + str(h) + "\n" + "Deaths: " + str(round(d)) + "\n" + "Years of life lost: " +
                           str(round(yoll)) + "\n" + "Prop immune: " + str(round(p_immune, 3))
                           )
 
-                    # run_all_phases(decision_vars[_mode], _country, _config, param_set, _mode)
-                    # break
+                # for param_set in param_set_list:
+                #     run_all_phases(decision_vars[_mode], _country, _config, param_set, _mode)
+                #     break
@@ -1,4 +1,5 @@
 import joypy
+import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
 from matplotlib import cm
@@ -19,17 +20,20 @@ def get_perc_recovered_by_age_and_time(calibration_output_path, country_name, bu
         agegroup = 5 * agegroup_index
         n_recovered = export_compartment_size("recoveredXagegroup_" + str(agegroup),  mcmc_tables, output_tables, derived_output_tables, weights)
 
-        # work out denominator
-        popsizes = {key: [0] * len(list(n_recovered.values())[0]) for key in n_recovered.keys()}
-        for comp in output_tables[0].columns:
-            if "agegroup_" + str(agegroup) in comp:
-                comp_sizes = export_compartment_size(comp,  mcmc_tables, output_tables, derived_output_tables, weights)
-                for key in n_recovered:
-                    popsizes[key] = [x + y for (x, y) in zip(popsizes[key], comp_sizes[key])]
+        # work out denominator, summing the sizes of all the age group's compartments in one pass for each time
+        comp_sizes_by_comp = [
+            export_compartment_size(comp,  mcmc_tables, output_tables, derived_output_tables, weights)
+            for comp in output_tables[0].columns
+            if "agegroup_" + str(agegroup) in comp
+        ]
+        popsizes = {
+            key: np.sum([comp_sizes[key] for comp_sizes in comp_sizes_by_comp], axis=0)
+            for key in n_recovered
+        }
 
         perc_recovered[agegroup] = {}
         for key in n_recovered:
-            perc_recovered[agegroup][key] = [100 * x / y for (x, y) in zip(n_recovered[key], popsizes[key])]
+            perc_recovered[agegroup][key] = (100 * np.array(n_recovered[key]) / popsizes[key]).tolist()
 
     file_path = os.path.join('dumped_dict.yml')
     with open(file_path, "w") as f:
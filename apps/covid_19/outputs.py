@@ -10,18 +10,25 @@ NOTIFICATION_STRATUM = ["sympt_isolate", "hospital_non_icu", "icu"]
 def get_calc_notifications_covid(
     implement_importation, prop_detected_func,
 ):
+    # The names of the notified progress outputs are the same at every time, so are only found on the first call
+    notification_outputs = []
+
     def calculate_notifications_covid(model: StratifiedModel, time: float):
         """
         Returns the number of notifications for a given time.
         The fully stratified incidence outputs must be available before calling this function
         """
+        if not notification_outputs:
+            for key in model.derived_outputs:
+                is_progress = "progressX" in key
+                is_notify_stratum = any([stratum in key for stratum in NOTIFICATION_STRATUM])
+                if is_progress and is_notify_stratum:
+                    notification_outputs.append(key)
+
         notifications_count = 0.0
         time_idx = model.times.index(time)
-        for key, value in model.derived_outputs.items():
-            is_progress = "progressX" in key
-            is_notify_stratum = any([stratum in key for stratum in NOTIFICATION_STRATUM])
-            if is_progress and is_notify_stratum:
-                notifications_count += value[time_idx]
+        for key in notification_outputs:
+            notifications_count += model.derived_outputs[key][time_idx]
 
         if implement_importation:
             notifications_count += (
@@ -69,14 +76,20 @@ def calculate_proportion_seropositive(model, time):
 
 
 def get_calculate_years_of_life_lost(life_expectancy_by_agegroup):
+    # Pairs of the name of each age-specific death output with its life expectancy, found on the first call
+    weighted_death_outputs = []
 
     def calculate_years_of_life_lost(model, time):
+        if not weighted_death_outputs:
+            for i, agegroup in enumerate(model.all_stratifications['agegroup']):
+                for derived_output in model.derived_outputs:
+                    if "infection_deathsXagegroup_" + agegroup in derived_output:
+                        weighted_death_outputs.append((derived_output, life_expectancy_by_agegroup[i]))
+
         time_idx = model.times.index(time)
         total_yoll = 0.
-        for i, agegroup in enumerate(model.all_stratifications['agegroup']):
-            for derived_output in model.derived_outputs:
-                if "infection_deathsXagegroup_" + agegroup in derived_output:
-                    total_yoll += model.derived_outputs[derived_output][time_idx] * life_expectancy_by_agegroup[i]
+        for derived_output, life_expectancy in weighted_death_outputs:
+            total_yoll += model.derived_outputs[derived_output][time_idx] * life_expectancy
 
         return total_yoll
 
@@ -28,19 +28,10 @@ class AgeMixingAdjustment(BaseMixingAdjustment):
         Apply time-varying age adjustments.
         Returns a new mixing matrix, modified to adjust for dynamic mixing changes for a given point in time.
         """
-        for row_index in range(len(AGE_INDICES)):
-            if row_index in self.age_adjustment_functions:
-                row_multiplier = self.age_adjustment_functions[row_index](time)
-            else:
-                row_multiplier = 1
-
-            for col_index in range(len(AGE_INDICES)):
-                if col_index in self.age_adjustment_functions:
-                    col_multiplier = self.age_adjustment_functions[col_index](time)
-                else:
-                    col_multiplier = 1
-
-                mixing_matrix[row_index, col_index] *= row_multiplier * col_multiplier
+        # Evaluate each age group's adjustment once, rather than once for every cell of its row and column
+        age_multipliers = np.ones(len(AGE_INDICES))
+        for age_idx, func in self.age_adjustment_functions.items():
+            age_multipliers[age_idx] = func(time)
 
+        mixing_matrix *= np.outer(age_multipliers, age_multipliers)
         return mixing_matrix
-
@@ -116,30 +116,21 @@ def stratify_by_clinical(model, model_parameters, compartments):
     }
 
     # Calculate the absolute proportion of all patients who should eventually reach hospital death or ICU death.
-    # Find IFR that needs to be contributed by ICU and non-ICU hospital deaths
-    hospital_death, icu_death = [], []
-    for age_idx, agegroup in enumerate(agegroup_strata):
-        # If IFR for age group is greater than absolute proportion hospitalised, increased hospitalised proportion
-        if infection_fatality_props[age_idx] > abs_props["hospital"][age_idx]:
-            abs_props["hospital"][age_idx] = infection_fatality_props[age_idx]
-
-        # Find the target absolute ICU mortality and the amount left over from IFRs to go to hospital, if any
-        target_icu_abs_mort = abs_props["icu"][age_idx] * icu_mortality_prop
-        left_over_mort = infection_fatality_props[age_idx] - target_icu_abs_mort
-
-        # If some IFR will be left over for the hospitalised
-        if left_over_mort > 0.0:
-            hospital_death_prop = left_over_mort
-            icu_death_prop = target_icu_abs_mort
-        # Otherwise if all IFR taken up by ICU
-        else:
-            hospital_death_prop = 0.0
-            icu_death_prop = infection_fatality_props[age_idx]
-
-        hospital_death.append(hospital_death_prop)
-        icu_death.append(icu_death_prop)
-
-    abs_props.update({"hospital_death": hospital_death, "icu_death": icu_death})
+    # Find IFR that needs to be contributed by ICU and non-ICU hospital deaths, across all age groups at once
+    infection_fatality_props_arr = np.array(infection_fatality_props)
+
+    # If IFR for age group is greater than absolute proportion hospitalised, increased hospitalised proportion
+    abs_props["hospital"] = np.maximum(sympt_hospital, infection_fatality_props_arr).tolist()
+
+    # Find the target absolute ICU mortality and the amount left over from IFRs to go to hospital, if any
+    target_icu_abs_mort = sympt_hospital_icu * icu_mortality_prop
+    left_over_mort = infection_fatality_props_arr - target_icu_abs_mort
+
+    # If some IFR will be left over for the hospitalised, otherwise all IFR taken up by ICU
+    is_left_over_mort = left_over_mort > 0.0
+    hospital_death = np.where(is_left_over_mort, left_over_mort, 0.0)
+    icu_death = np.where(is_left_over_mort, target_icu_abs_mort, infection_fatality_props_arr)
+    abs_props.update({"hospital_death": hospital_death.tolist(), "icu_death": icu_death.tolist()})
 
     # FIXME: These depend on static variables which have been made time-variant.
     # fatality rate for hospitalised patients
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from summer.model import StratifiedModel
 from autumn.constants import Compartment, BirthApproach
 from autumn.tool_kit.scenarios import get_model_times_from_inputs
@@ -5,6 +7,16 @@ from summer.model.utils.flowchart import create_flowchart
 from autumn.curve import scale_up_function
 
 
+# Keep the most recent detection and treatment success curves, which are reused when the model is rebuilt with the same
+# values. Calibration varies their start times and levels, so older curves are dropped rather than kept for the run.
+@lru_cache(maxsize=2)
+def get_scale_up_curve(start_time: float, final_level: float):
+    """
+    Sigmoidal scale-up from zero at start_time to final_level in 2020
+    """
+    return scale_up_function([start_time, 2020], [0., final_level], method=4)
+
+
 def build_model(params: dict, update_params={}) -> StratifiedModel:
     """
     Build the master function to run a simple SIR model
@@ -107,38 +119,38 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
     tb_sir_model.adaptation_functions['universal_death_rateX'] = lambda x: 1./70
 
 # #   add  time_variant parameters
-    def time_variant_CDR():
-        times = [params['cdr_start_time'], 2020]
-        values = [0., params['cdr_final_level']]
-        return scale_up_function(times, values, method=4)
-
-    my_tv_cdr = time_variant_CDR()
+    my_tv_cdr = get_scale_up_curve(params['cdr_start_time'], params['cdr_final_level'])
+    my_tv_tsr = get_scale_up_curve(params['tsr_start_time'], params['tsr_final_level'])
 
-    def time_variant_TSR():
-        times = [params['tsr_start_time'], 2020]
-        values = [0., params['tsr_final_level']]
-        return scale_up_function(times, values, method=4)
-
-    my_tv_tsr = time_variant_TSR()
+    # every treatment-related flow needs both the detection rate and the TSR at the same time point,
+    # so evaluate the two curves together once per time rather than once per flow
+    @lru_cache(maxsize=1)
+    def get_detection_rate_and_tsr(time):
+        cdr = my_tv_cdr(time)
+        detection_rate = cdr / (1 - cdr) * (params['gamma'] + params['universal_death_rate'] + params['infect_death']) #calculating the time varaint detection rate from tv CDR
+        return detection_rate, my_tv_tsr(time)
 
     def my_tv_tau(time):  # this is for DS-TB
-        return my_tv_detection_rate(time) * my_tv_tsr(time)
+        detection_rate, tsr = get_detection_rate_and_tsr(time)
+        return detection_rate * tsr
 
     tb_sir_model.adaptation_functions["tau"] = my_tv_tau
     tb_sir_model.parameters["tau"] = "tau"
 
-    def my_tv_detection_rate(time):
-        return my_tv_cdr(time)/(1-my_tv_cdr(time)) * (params['gamma'] + params['universal_death_rate'] + params['infect_death']) #calculating the time varaint detection rate from tv CDR
-
 
    #adding strain stratification
+    strains = ['ds', 'inh_R', 'rif_R', 'mdr']
+
+    # strain stratum names and infectious compartment names, built once and reused below
+    strain_strata = {strain: "strain_" + strain for strain in strains}
+    infectious_strain_compartments = {strain: "infectiousXstrain_" + strain for strain in strains}
 
     stratify_by = ['strain']  # ['strain', 'treatment_type']
 
     if 'strain' in stratify_by:
 
         tb_sir_model.stratify(
-            "strain", ['ds', 'inh_R', 'rif_R', 'mdr'],
+            "strain", strains,
             compartment_types_to_stratify=[Compartment.EARLY_LATENT, Compartment.LATE_LATENT, Compartment.INFECTIOUS],
             requested_proportions={'ds': 1., 'inh_R': 0., 'rif_R':0., 'mdr': 0.},
             verbose=False,
@@ -158,7 +170,8 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
                      "implement": len(tb_sir_model.all_stratifications)})
 
         def tv_amplification_ds_to_inh_rate(time):
-            return my_tv_detection_rate(time) * (1 - my_tv_tsr(time)) * params['prop_of_failures_developing_inh_R']
+            detection_rate, tsr = get_detection_rate_and_tsr(time)
+            return detection_rate * (1 - tsr) * params['prop_of_failures_developing_inh_R']
 
         tb_sir_model.adaptation_functions["dr_amplification_ds_to_inh"] = tv_amplification_ds_to_inh_rate
         tb_sir_model.parameters["dr_amplification_ds_to_inh"] = "dr_amplification_ds_to_inh"
@@ -171,7 +184,8 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
                      "implement": len(tb_sir_model.all_stratifications)})
 
         def tv_amplification_ds_to_rif_rate(time):
-            return my_tv_detection_rate(time) * (1 - my_tv_tsr(time)) * params['prop_of_failures_developing_rif_R']
+            detection_rate, tsr = get_detection_rate_and_tsr(time)
+            return detection_rate * (1 - tsr) * params['prop_of_failures_developing_rif_R']
 
         tb_sir_model.adaptation_functions["dr_amplification_ds_to_rif"] = tv_amplification_ds_to_rif_rate
         tb_sir_model.parameters["dr_amplification_ds_to_rif"] = "dr_amplification_ds_to_rif"
@@ -183,7 +197,8 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
                  "implement": len(tb_sir_model.all_stratifications)})
 
         def tv_amplification_inh_to_mdr_rate(time):
-            return my_tv_detection_rate(time) * (1 - (my_tv_tsr(time) * params['relative_TSR_H'])) * params['prop_of_failures_developing_inh_R']
+            detection_rate, tsr = get_detection_rate_and_tsr(time)
+            return detection_rate * (1 - (tsr * params['relative_TSR_H'])) * params['prop_of_failures_developing_inh_R']
 
         tb_sir_model.adaptation_functions["dr_amplification_inh_to_mdr"] = tv_amplification_inh_to_mdr_rate
         tb_sir_model.parameters["dr_amplification_inh_to_mdr"] = "dr_amplification_inh_to_mdr"
@@ -195,7 +210,8 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
                  "implement": len(tb_sir_model.all_stratifications)})
 
         def tv_amplification_rif_to_mdr_rate(time):
-            return my_tv_detection_rate(time) * (1 - (my_tv_tsr(time) * params['relative_TSR_R'])) * params['prop_of_failures_developing_rif_R']
+            detection_rate, tsr = get_detection_rate_and_tsr(time)
+            return detection_rate * (1 - (tsr * params['relative_TSR_R'])) * params['prop_of_failures_developing_rif_R']
 
         tb_sir_model.adaptation_functions["dr_amplification_rif_to_mdr"] = tv_amplification_rif_to_mdr_rate
         tb_sir_model.parameters["dr_amplification_rif_to_mdr"] = "dr_amplification_rif_to_mdr"
@@ -205,11 +221,11 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
     flow_connections = {}
 
     #### track notifications in the model
-    for strain in ['ds', 'inh_R', 'rif_R', 'mdr']:
+    for strain in strains:
         flow_connections["recovery_tracker_" + strain] = {
             "origin": Compartment.INFECTIOUS,
             "to": Compartment.RECOVERED,
-            "origin_condition": "strain_" + strain,
+            "origin_condition": strain_strata[strain],
             "to_condition": "",
         }
 
@@ -223,21 +239,21 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
         flow_connections["incidence_progression_early" + destination_strain] = {
             "origin": Compartment.EARLY_LATENT,
             "to": Compartment.INFECTIOUS,
-            "origin_condition": "strain_" + destination_strain,
+            "origin_condition": strain_strata[destination_strain],
             "to_condition": "",
         }
         flow_connections["incidence_progression_late" + destination_strain] = {
             "origin": Compartment.LATE_LATENT,
             "to": Compartment.INFECTIOUS,
-            "origin_condition": "strain_" + destination_strain,
+            "origin_condition": strain_strata[destination_strain],
             "to_condition": "",
         }
         for source_strain in source_strains:
             flow_connections[f"incidence_ampli_from_{source_strain}_to_{destination_strain}"] = {
                 "origin": Compartment.INFECTIOUS,
                 "to": Compartment.INFECTIOUS,
-                "origin_condition": "strain_" + source_strain,
-                "to_condition": "strain_" + destination_strain,
+                "origin_condition": strain_strata[source_strain],
+                "to_condition": strain_strata[destination_strain],
             }
 
     tb_sir_model.output_connections = flow_connections
@@ -262,19 +278,21 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
     def get_notifications(model, time):
         notifications_count = 0.0
         time_idx = model.times.index(time)
-        for strain in ['ds', 'inh_R', 'rif_R', 'mdr']:
+        for strain in strains:
             notifications_count += model.derived_outputs["recovery_tracker_" + strain][time_idx] / tsr_by_strain[strain](time)
         return notifications_count
 
     tb_sir_model.derived_output_functions["notifications"] = get_notifications
 
+    # the compartments counted by the prevalence outputs are fixed once the model is stratified
+    infectious_compartments_indices = \
+        [i for i, c in enumerate(tb_sir_model.compartment_names) if 'infectious' in c]
+
     # calculate prevalence infectious
     def get_prev_infectious(model, time):
         time_idx = model.times.index(time)
-        infectious_compartments_indices = [i for i, c in enumerate(model.compartment_names) if 'infectious' in c]
-        prev_infectious = sum([float(model.outputs[time_idx, i]) for i in infectious_compartments_indices])
-        prev_infectious_prop = prev_infectious /\
-                               sum([float(model.outputs[time_idx, i]) for i in range(len(model.compartment_names))])
+        prev_infectious = model.outputs[time_idx, infectious_compartments_indices].sum()
+        prev_infectious_prop = prev_infectious / model.outputs[time_idx].sum()
         return prev_infectious_prop
 
     tb_sir_model.derived_output_functions["prev_infectious"] = get_prev_infectious
@@ -282,12 +300,14 @@ def build_model(params: dict, update_params={}) -> StratifiedModel:
     # calculate proportion of strain-specific TB
     def make_get_strain_perc(strain):
         # strain is one of ['ds','inh_R', 'rif_R', 'mdr']
+        infectious_strain_compartment = infectious_strain_compartments[strain]
+        infectious_strain_compartments_indices = \
+            [i for i, c in enumerate(tb_sir_model.compartment_names) if infectious_strain_compartment in c]
+
         def get_perc_strain(model, time):
             time_idx = model.times.index(time)
-            infectious_compartments_indices = [i for i, c in enumerate(model.compartment_names) if 'infectious' in c]
-            prev_infectious = sum([float(model.outputs[time_idx, i]) for i in infectious_compartments_indices])
-            infectious_strain_compartments_indices = [i for i, c in enumerate(model.compartment_names) if 'infectiousXstrain_' + strain in c]
-            prev_infectious_strain = sum([float(model.outputs[time_idx, i]) for i in infectious_strain_compartments_indices])
+            prev_infectious = model.outputs[time_idx, infectious_compartments_indices].sum()
+            prev_infectious_strain = model.outputs[time_idx, infectious_strain_compartments_indices].sum()
             perc_strain = 100. * prev_infectious_strain / prev_infectious
             return perc_strain
         return get_perc_strain
@@ -14,7 +14,7 @@ with open(PARAMS_PATH, "r") as f:
     params = yaml.safe_load(f)
 
 
-def run_calibration_chain(max_seconds: int, run_id: int):
+def run_calibration_chain(max_seconds: int, run_id: int, num_chains: int):
     """
     Run a calibration chain for the Mongolia TB model
 
@@ -30,7 +30,7 @@ def run_calibration_chain(max_seconds: int, run_id: int):
         TARGET_OUTPUTS,
         MULTIPLIERS,
         run_id,
-        total_nb_chains=1,
+        total_nb_chains=num_chains,
     )
     print("Starting calibration.")
     calib.run_fitting_algorithm(
@@ -129,29 +129,28 @@ def build_model(params: dict) -> StratifiedModel:
             if "location_" in component or "strain_" in component:
                 tags.append(component)
 
+        # the detection flows and the treatment success rates do not depend on the infectious compartment
+        detection_indices = [
+            index for index, val in dict_flows["parameter"].items() if "case_detection" in val
+        ]
+        ds_tsr = mongolia_tsr(_time) + external_params["reduction_negative_tx_outcome"] * (
+            1.0 - mongolia_tsr(_time)
+        )
+        mdr_tsr = external_params["mdr_tsr"] * external_params["prop_mdr_detected_as_mdr"]
+
         # loop through all relevant infectious compartments
         total_tb_detected = 0.0
         for comp_ind in model.infectious_indices["all_strains"]:
-            active_components = find_name_components(model.compartment_names[comp_ind])
+            comp_name = model.compartment_names[comp_ind]
+            active_components = find_name_components(comp_name)
             if all(elem in active_components for elem in tags):
                 infectious_pop = _compartment_values[comp_ind]
-                detection_indices = [
-                    index
-                    for index, val in dict_flows["parameter"].items()
-                    if "case_detection" in val
-                ]
                 flow_index = [
-                    index
-                    for index in detection_indices
-                    if dict_flows["origin"][index] == model.compartment_names[comp_ind]
+                    index for index in detection_indices if dict_flows["origin"][index] == comp_name
                 ][0]
                 param_name = dict_flows["parameter"][flow_index]
                 detection_tx_rate = model.get_parameter_value(param_name, _time)
-                tsr = mongolia_tsr(_time) + external_params["reduction_negative_tx_outcome"] * (
-                    1.0 - mongolia_tsr(_time)
-                )
-                if "strain_mdr" in model.compartment_names[comp_ind]:
-                    tsr = external_params["mdr_tsr"] * external_params["prop_mdr_detected_as_mdr"]
+                tsr = mdr_tsr if "strain_mdr" in comp_name else ds_tsr
                 if tsr > 0.0:
                     total_tb_detected += infectious_pop * detection_tx_rate / tsr
 
@@ -583,9 +582,9 @@ def build_model(params: dict) -> StratifiedModel:
 
             def calculate_nb_detected(model, time):
                 nb_treated = 0.0
+                this_time_index = model.times.index(time)
                 for key, value in model.derived_outputs.items():
                     if "notifications" in key and tag in key:
-                        this_time_index = model.times.index(time)
                         nb_treated += value[this_time_index]
                 return nb_treated
 
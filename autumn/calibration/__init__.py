@@ -1,2 +1,7 @@
-from .calibration import Calibration, get_parameter_bounds_from_priors, CalibrationMode
+from .calibration import (
+    Calibration,
+    get_parameter_bounds_from_priors,
+    CalibrationMode,
+    run_calibration_chains,
+)
 from .runner import run_full_models_for_mcmc
@@ -1,6 +1,7 @@
 import yaml
 import os
 import logging
+import multiprocessing
 from time import time
 from itertools import chain, product
 from datetime import datetime
@@ -22,14 +23,14 @@ from autumn.plots.calibration_plots import plot_all_priors
 from autumn.tool_kit.scenarios import Scenario
 from autumn.tool_kit.params import update_params
 from autumn.tool_kit.utils import (
-    get_git_branch,
-    get_git_hash,
+    get_git_info,
     get_data_hash,
 )
 from .utils import (
     find_decent_starting_point,
-    calculate_prior,
+    get_log_prior_arrays,
     specify_missing_prior_params,
+    sum_log_priors,
     raise_error_unsupported_prior,
     sample_starting_params_from_lhs,
 )
@@ -100,6 +101,11 @@ class Calibration:
         )
         self.adaptive_proposal = adaptive_proposal
 
+        # The prevalence outputs and the MCMC run columns are the same for every iteration, so find them once
+        prev_targets = [t for t in targeted_outputs if "prevX" in t["output_key"]]
+        self.requested_prev_outputs = [t["output_key"] for t in prev_targets]
+        self.requested_prev_times = {t["output_key"]: t["years"] for t in prev_targets}
+        self.mcmc_run_colnames = self.param_list + ["loglikelihood", "accept"]
 
         # Validate target output start time.
         model_start = model_parameters["default"]["start_time"]
@@ -126,6 +132,7 @@ class Calibration:
 
         # Select starting params
         specify_missing_prior_params(self.priors)
+        self.prior_codes, self.prior_distri_params = get_log_prior_arrays(self.priors, self.param_list)
         np.random.seed(0)  # Set deterministic random seed for Latin Hypercube Sampling
         starting_points = sample_starting_params_from_lhs(self.priors, total_nb_chains)
         self.starting_point = starting_points[chain_index - 1]
@@ -143,12 +150,13 @@ class Calibration:
         self.write_metadata(output_dir, f"params-{self.chain_index}.yml", model_parameters)
         self.write_metadata(output_dir, f"priors-{self.chain_index}.yml", priors)
         self.write_metadata(output_dir, f"targets-{self.chain_index}.yml", targeted_outputs)
+        git_commit, git_branch = get_git_info()
         metadata = {
             "model_name": model_name,
             "param_set_name": param_set_name,
             "start_time": datetime.now().strftime("%Y-%m-%d--%H-%M-%S"),
-            "git_branch": get_git_branch(),
-            "git_commit": get_git_hash(),
+            "git_branch": git_branch,
+            "git_commit": git_commit,
         }
         self.write_metadata(output_dir, f"meta-{self.chain_index}.yml", metadata)
 
@@ -160,6 +168,7 @@ class Calibration:
         self.format_data_as_array()
         self.workout_unspecified_target_sds()  # for likelihood definition
         self.workout_unspecified_time_weights()  # for likelihood weighting
+        self.target_arrays = self.get_target_arrays()  # for likelihood evaluation
         self.workout_unspecified_jumping_sds()  # for proposal function definition
 
         self.param_bounds = self.get_parameter_bounds()
@@ -169,6 +178,7 @@ class Calibration:
         self.run_mode = None
         self.main_table = {}
         self.mcmc_trace_matrix = None  # will store the results of the MCMC model calibration
+        self.mcmc_trace_buffer = None  # preallocated storage that the MCMC trace matrix is a view of
         self.mle_estimates = {}  # will store the results of the maximum-likelihood calibration
 
         self.evaluated_params_ll = []  # list of tuples:  [(theta_0, ll_0), (theta_1, ll_1), ...]
@@ -217,10 +227,7 @@ class Calibration:
         mcmc_run_dict = {k: v for k, v in zip(self.param_list, proposed_params)}
         mcmc_run_dict["loglikelihood"] = proposed_loglike
         mcmc_run_dict["accept"] = 1 if accept else 0
-        mcmc_run_colnames = self.param_list.copy()
-        mcmc_run_colnames.append("loglikelihood")
-        mcmc_run_colnames.append("accept")
-        mcmc_run_df = pd.DataFrame(mcmc_run_dict, columns=mcmc_run_colnames, index=[i_run])
+        mcmc_run_df = pd.DataFrame(mcmc_run_dict, columns=self.mcmc_run_colnames, index=[i_run])
         store_database(
             mcmc_run_df, table_name="mcmc_run", run_idx=i_run, database_path=self.output_db_path,
         )
@@ -232,23 +239,21 @@ class Calibration:
         logger.info(f"Running iteration {self.iter_num}...")
 
         # Update default parameters to use calibration params.
-        param_updates = {"end_time": self.end_time}
-        for i, param_name in enumerate(self.param_list):
-            param_updates[param_name] = proposed_params[i]
-
-        params = copy.deepcopy(self.model_parameters)
-        params["default"] = update_params(params["default"], param_updates)
+        # update_params copies the default parameters and the scenario copies all of them, so there is no need to
+        # deep copy them here as well.
+        param_updates = {"end_time": self.end_time, **dict(zip(self.param_list, proposed_params))}
+        params = {
+            **self.model_parameters,
+            "default": update_params(self.model_parameters["default"], param_updates),
+        }
         scenario = Scenario(self.model_builder, 0, params)
         scenario.run()
         self.latest_scenario = scenario
 
-        _req_outs = [o for o in self.targeted_outputs if "prevX" in o["output_key"]]
-        requested_outputs = [o["output_key"] for o in _req_outs]
-        requested_times = {o["output_key"]: o["years"] for o in _req_outs}
         pp = post_proc.PostProcessing(
             scenario.model,
-            requested_outputs=requested_outputs,
-            requested_times=requested_times,
+            requested_outputs=self.requested_prev_outputs,
+            requested_times=self.requested_prev_times,
             multipliers=self.multipliers,
         )
 
@@ -260,6 +265,7 @@ class Calibration:
         """
         scenario, pp = self.run_model_with_params(params)
 
+        model_times = np.asarray(scenario.model.times)
         model_start_time = pp.derived_outputs["times"][0]
         considered_start_times = [model_start_time]
         best_start_time = None
@@ -273,23 +279,20 @@ class Calibration:
         for considered_start_time in considered_start_times:
             time_shift = considered_start_time - model_start_time
             ll = 0  # loglikelihood if using bayesian approach. Sum of squares if using lsm mode
-            for target in self.targeted_outputs:
+            for target, target_arrays in zip(self.targeted_outputs, self.target_arrays):
                 key = target["output_key"]
-                data = np.array(target["values"])
-                time_weigths = target["time_weights"]
+                data = target_arrays["values"]
+                time_weights = target_arrays["time_weights"]
                 if key in pp.generated_outputs:
                     model_output = np.array(pp.generated_outputs[key])
                 else:
-                    indices = []
-                    for year in target["years"]:
-                        time_idx = scenario.model.times.index(year - time_shift)
-                        indices.append(time_idx)
-
-                    model_output = np.array([pp.derived_outputs[key][index] for index in indices])
+                    model_output = get_output_at_times(
+                        model_times, pp.derived_outputs[key], target_arrays["years"] - time_shift
+                    )
 
                 if self.run_mode == CalibrationMode.LEAST_SQUARES:
                     squared_distance = (data - model_output) ** 2
-                    ll += np.sum([w * d for (w, d) in zip(time_weigths, squared_distance)])
+                    ll += np.dot(time_weights, squared_distance)
                 else:
                     if "loglikelihood_distri" not in target:  # default distribution
                         target["loglikelihood_distri"] = "normal"
@@ -299,28 +302,31 @@ class Calibration:
                         else:
                             normal_sd = target["sd"]
                         squared_distance = (data - model_output) ** 2
-                        ll += -(0.5 / normal_sd ** 2) * np.sum([w * d for (w, d) in zip(time_weigths, squared_distance)])
+                        ll += -(0.5 / normal_sd ** 2) * np.dot(time_weights, squared_distance)
                     elif target["loglikelihood_distri"] == "poisson":
-                        for i in range(len(data)):
-                            ll += (
-                                round(data[i]) * math.log(abs(model_output[i]))
-                                - model_output[i]
-                                - math.log(math.factorial(round(data[i])))
-                            ) * time_weigths[i]
+                        poisson_lls = (
+                            target_arrays["counts"] * np.log(np.abs(model_output))
+                            - model_output
+                            - target_arrays["log_count_factorials"]
+                        )
+                        ll += np.dot(time_weights, poisson_lls)
                     elif target["loglikelihood_distri"] == "negative_binomial":
-                        assert key + "_dispersion_param" in self.param_list
                         # the dispersion parameter varies during the MCMC. We need to retrieve its value
-                        n = [
-                            params[i]
-                            for i in range(len(params))
-                            if self.param_list[i] == key + "_dispersion_param"
-                        ][0]
-                        for i in range(len(data)):
-                            # We use the parameterisation based on mean and variance and assume define var=mean**delta
-                            mu = model_output[i]
-                            # work out parameter p to match the distribution mean with the model output
-                            p = mu / (mu + n)
-                            ll += stats.nbinom.logpmf(round(data[i]), n, 1.0 - p) * time_weigths[i]
+                        n = params[self.param_list.index(key + "_dispersion_param")]
+                        # We use the parameterisation based on mean and variance and assume define var=mean**delta
+                        mu = model_output
+                        # work out parameter p to match the distribution mean with the model output
+                        p = mu / (mu + n)
+                        # closed-form log-pmf of the counts, matching scipy.stats.nbinom.logpmf(counts, n, 1.0 - p)
+                        counts = target_arrays["counts"]
+                        nbinom_lls = (
+                            special.gammaln(counts + n)
+                            - special.gammaln(n)
+                            - target_arrays["log_count_factorials"]
+                            + n * np.log(1.0 - p)
+                            + special.xlogy(counts, p)
+                        )
+                        ll += np.dot(time_weights, nbinom_lls)
                     else:
                         raise ValueError("Distribution not supported in loglikelihood_distri")
 
@@ -395,8 +401,28 @@ class Calibration:
                 target["time_weights"] = [1.0 / len(target["years"])] * len(target["years"])
             else:
                 assert isinstance(target["time_weights"], list) and len(target["time_weights"]) == len(target["years"])
-                s = sum(target["time_weights"])
-                target["time_weights"] = [w / s for w in target["time_weights"]]
+                time_weights = np.array(target["time_weights"], dtype=float)
+                target["time_weights"] = (time_weights / time_weights.sum()).tolist()
+
+    def get_target_arrays(self):
+        """
+        The data and weights of the calibration targets do not change between iterations, so convert them to arrays
+        once, along with the rounded counts and their log-factorials used by the count likelihoods.
+        """
+        target_arrays = []
+        for target in self.targeted_outputs:
+            values = np.array(target["values"], dtype=float)
+            counts = np.round(values)
+            target_arrays.append(
+                {
+                    "years": np.array(target["years"], dtype=float),
+                    "values": values,
+                    "time_weights": np.array(target["time_weights"], dtype=float),
+                    "counts": counts,
+                    "log_count_factorials": special.gammaln(counts + 1.0),
+                }
+            )
+        return target_arrays
 
     def workout_unspecified_jumping_sds(self):
         for i, prior_dict in enumerate(self.priors):
@@ -506,31 +532,31 @@ class Calibration:
         return adaptive_cov_matrix
 
     def get_parameter_bounds(self):
-        param_bounds = None
-        for i, prior_dict in enumerate(self.priors):
-            # Work out bounds for acceptable values, using the support of the prior distribution
-            lower_bound, upper_bound = get_parameter_bounds_from_priors(prior_dict)
-            if i == 0:
-                param_bounds = np.array([[lower_bound, upper_bound]])
-            else:
-                param_bounds = np.concatenate((param_bounds, np.array([[lower_bound, upper_bound]])))
-        return param_bounds
+        # Work out bounds for acceptable values, using the support of the prior distribution
+        return np.array(
+            [get_parameter_bounds_from_priors(prior_dict) for prior_dict in self.priors], dtype=float
+        )
 
     def sample_from_adaptive_gaussian(self, prev_params, adaptive_cov_matrix):
         lower_bounds = self.param_bounds[:, 0]
         upper_bounds = self.param_bounds[:, 1]
 
-        new_params = copy.deepcopy(lower_bounds)
-        new_params[0] -= 10.
+        # Factorise the covariance matrix once for all the attempts, in the same way as
+        # np.random.multivariate_normal, which would otherwise repeat the decomposition for every redraw
+        _, singular_values, right_vectors = np.linalg.svd(adaptive_cov_matrix)
+        transform = np.sqrt(singular_values)[:, None] * right_vectors
+        prev_params = np.asarray(prev_params, dtype=float)
+
         n_attempts = 0
-        while any(lower_bounds > new_params) or any(upper_bounds < new_params):
-            new_params = np.random.multivariate_normal(prev_params, adaptive_cov_matrix)
+        while True:
+            new_params = prev_params + np.random.standard_normal(len(prev_params)).dot(transform)
             n_attempts += 1
             if n_attempts > 1.e4:
                 raise ValueError(
                             "Failed to draw an acceptable parameter set after 10,000 attempts."
                         )
-        return new_params
+            if not np.any((new_params < lower_bounds) | (new_params > upper_bounds)):
+                return new_params
 
     def run_autumn_mcmc(self, n_iterations: int, n_burned: int, n_chains: int, available_time):
         """
@@ -542,6 +568,7 @@ class Calibration:
             raise ValueError(msg)
 
         self.mcmc_trace_matrix = None # will store param trace and loglikelihood evolution
+        self.mcmc_trace_buffer = None
 
         last_accepted_params = None
         last_acceptance_quantity = None  # acceptance quantity is defined as loglike + logprior
@@ -566,8 +593,9 @@ class Calibration:
             if is_auto_accept:
                 accept = True
             else:
-                accept_prob = np.exp(proposed_acceptance_quantity - last_acceptance_quantity)
-                accept = np.random.binomial(n=1, p=accept_prob, size=1) > 0
+                # Accept with probability exp(difference), comparing in log space rather than exponentiating
+                log_accept_prob = proposed_acceptance_quantity - last_acceptance_quantity
+                accept = np.log(np.random.random_sample()) < log_accept_prob
 
             # Update stored quantities.
             if accept:
@@ -604,6 +632,7 @@ class Calibration:
         assert all([p in self.param_list for p in new_param_list])
 
         self.param_list = new_param_list
+        self.prior_codes, self.prior_distri_params = get_log_prior_arrays(self.priors, self.param_list)
 
         param_values = []
         for i, param_name in enumerate(self.param_list):
@@ -644,25 +673,28 @@ class Calibration:
                 print("Using adaptive approach")
 
         if not use_adaptive_proposal:
-            for i, prior_dict in enumerate(self.priors):
-                # Work out bounds for acceptable values, using the support of the prior distribution
-                lower_bound = self.param_bounds[i, 0]
-                upper_bound = self.param_bounds[i, 1]
-                sample = lower_bound - 10.0  # deliberately initialise out of parameter scope
-                n_attempts = 0
-                while not lower_bound <= sample <= upper_bound:
-                    sample = np.random.normal(
-                        loc=prev_params[i], scale=prior_dict["jumping_sd"], size=1
-                    )[0]
-                    n_attempts += 1
-                    if n_attempts > 1.0e4:
-                        raise ValueError(
-                            "Failed to draw an acceptable value for "
-                            + prior_dict["param_name"]
-                            + "after 10,000 attempts. Check that its initial value is within the prior's support."
-                        )
+            # Draw all the parameters together, then redraw only those outside the support of their prior distribution
+            lower_bounds = self.param_bounds[:, 0]
+            upper_bounds = self.param_bounds[:, 1]
+            prev_params = np.array(prev_params, dtype=float)
+            jumping_sds = np.array([prior_dict["jumping_sd"] for prior_dict in self.priors])
+            samples = np.empty(len(self.priors))
+            is_rejected = np.ones(len(self.priors), dtype=bool)
+            n_attempts = 0
+            while is_rejected.any():
+                samples[is_rejected] = np.random.normal(
+                    loc=prev_params[is_rejected], scale=jumping_sds[is_rejected]
+                )
+                is_rejected = (samples < lower_bounds) | (samples > upper_bounds)
+                n_attempts += 1
+                if n_attempts > 1.0e4 and is_rejected.any():
+                    raise ValueError(
+                        "Failed to draw an acceptable value for "
+                        + self.priors[np.flatnonzero(is_rejected)[0]]["param_name"]
+                        + "after 10,000 attempts. Check that its initial value is within the prior's support."
+                    )
 
-                new_params.append(sample)
+            new_params = samples.tolist()
         return new_params
 
     def logprior(self, params):
@@ -671,12 +703,8 @@ class Calibration:
         :param params: model parameters as a list of values ordered using the order of self.priors
         :return: the natural log of the joint prior
         """
-        logp = 0.0
-        for i, param_name in enumerate(self.param_list):
-            prior_dict = [d for d in self.priors if d["param_name"] == param_name][0]
-            logp += calculate_prior(prior_dict, params[i], log=True)
-
-        return logp
+        param_values = np.array(params, dtype=float)
+        return float(sum_log_priors(param_values, self.prior_codes, self.prior_distri_params))
 
     def update_mcmc_trace(self, params_to_store):
         """
@@ -684,10 +712,16 @@ class Calibration:
         :param params_to_store: model parameters as a list of values ordered using the order of self.priors
         :param loglike_to_store: current loglikelihood value
         """
-        if self.mcmc_trace_matrix is None:
-            self.mcmc_trace_matrix = np.array([params_to_store])
-        else:
-            self.mcmc_trace_matrix = np.concatenate((self.mcmc_trace_matrix, np.array([params_to_store])))
+        # the trace is written into a buffer whose capacity doubles when full, rather than copying the whole trace to
+        # append each iteration
+        n_rows = 0 if self.mcmc_trace_matrix is None else len(self.mcmc_trace_matrix)
+        if self.mcmc_trace_buffer is None or n_rows == len(self.mcmc_trace_buffer):
+            new_buffer = np.empty((max(2 * n_rows, 100), len(params_to_store)))
+            new_buffer[:n_rows] = self.mcmc_trace_matrix
+            self.mcmc_trace_buffer = new_buffer
+
+        self.mcmc_trace_buffer[n_rows] = params_to_store
+        self.mcmc_trace_matrix = self.mcmc_trace_buffer[: n_rows + 1]
 
 
     def dump_mle_params_to_yaml_file(self):
@@ -702,9 +736,62 @@ class Calibration:
             yaml.dump(dict_to_dump, outfile, default_flow_style=False)
 
 
+def get_output_at_times(model_times: np.ndarray, output, times: np.ndarray):
+    """
+    Look up the values of a model output at the requested times, which must all be model times.
+    The model times are sorted, so all of the requested times are binary searched together.
+    """
+    indices = np.searchsorted(model_times, times)
+    if np.any(indices == len(model_times)) or np.any(model_times[indices] != times):
+        raise ValueError("Target times are not all model times")
+    return np.asarray(output)[indices]
+
+
 def get_random_seed(chain_index: int):
     """
     Get a random seed for the calibration.
     Mocked out by unit tests.
     """
     return chain_index + int(time())
+
+
+def run_calibration_chains(
+    calibrate_func: Callable, max_seconds: int, num_chains: int, num_workers: int = None
+):
+    """
+    Run every chain of a calibration locally, each chain in its own worker process.
+    The chains are independent, so they write to separate databases and are combined afterwards, as for remote runs.
+    calibrate_func is an app's chain runner, called with the runtime, the chain id and the number of chains.
+    """
+    chain_ids = list(range(num_chains))
+    num_workers = min(num_workers or os.cpu_count(), num_chains)
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if num_workers < 2 or not can_fork:
+        for chain_id in chain_ids:
+            calibrate_func(max_seconds, chain_id, num_chains)
+        return
+
+    # Hand the chain runner to each worker once, when it is forked, so that each task only sends the chain id.
+    logger.info("Running %s calibration chains in %s processes", num_chains, num_workers)
+    with multiprocessing.get_context("fork").Pool(
+        processes=num_workers, initializer=_init_chain_worker, initargs=(calibrate_func,),
+    ) as pool:
+        chain_results = [
+            pool.apply_async(_run_worker_chain, (max_seconds, chain_id, num_chains))
+            for chain_id in chain_ids
+        ]
+        for chain_result in chain_results:
+            chain_result.get()
+
+
+# The chain runner for this worker process, set when the worker starts.
+_worker_calibrate_func = None
+
+
+def _init_chain_worker(calibrate_func: Callable):
+    global _worker_calibrate_func
+    _worker_calibrate_func = calibrate_func
+
+
+def _run_worker_chain(max_seconds: int, chain_id: int, num_chains: int):
+    _worker_calibrate_func(max_seconds, chain_id, num_chains)
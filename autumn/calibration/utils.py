@@ -4,13 +4,24 @@ from typing import List, Dict, Any
 import pandas as pd
 
 import numpy as np
-from pyDOE import lhs
+from numba import jit
 from scipy import stats, special
 from scipy.optimize import minimize
 
 from autumn.db import Database
 
 
+def sample_latin_hypercube(n_samples: int, n_dims: int):
+    """
+    Draw a centred Latin hypercube, with each column a random permutation of the centres of n_samples equal-width bins
+    :param n_samples: integer
+    :param n_dims: integer
+    :return: array of shape (n_samples, n_dims) with all values in [0-1]
+    """
+    bin_indices = np.argsort(np.random.rand(n_samples, n_dims), axis=0)
+    return (bin_indices + 0.5) / n_samples
+
+
 def sample_starting_params_from_lhs(par_priors: List[Dict[str, Any]], n_samples: int):
     """
     Use Latin Hypercube Sampling to define MCMC starting points
@@ -18,35 +29,37 @@ def sample_starting_params_from_lhs(par_priors: List[Dict[str, Any]], n_samples:
     :param n_samples: integer
     :return: a list of dictionaries
     """
-    list_of_starting_params = [{} for _ in range(n_samples)]
-
     # Draw a Latin hypercube (all values in [0-1])
-    hypercube = lhs(n=len(par_priors), samples=n_samples, criterion="center")
-    for j, prior_dict in enumerate(par_priors):
-        for i in range(n_samples):
-            prop = hypercube[i, j]
-            if prior_dict["distribution"] == "uniform":
-                quantile = prior_dict["distri_params"][0] + prop * (
-                    prior_dict["distri_params"][1] - prior_dict["distri_params"][0]
-                )
-            elif prior_dict["distribution"] == "lognormal":
-                mu = prior_dict["distri_params"][0]
-                sd = prior_dict["distri_params"][1]
-                quantile = math.exp(mu + math.sqrt(2) * sd * special.erfinv(2 * prop - 1))
-            elif prior_dict["distribution"] == "beta":
-                quantile = stats.beta.ppf(
-                    prop, prior_dict["distri_params"][0], prior_dict["distri_params"][1],
-                )[0]
-            elif prior_dict["distribution"] == "gamma":
-                quantile = stats.gamma.ppf(
-                    prop, prior_dict["distri_params"][0], 0.0, prior_dict["distri_params"][1],
-                )[0]
-            else:
-                raise_error_unsupported_prior(prior_dict["distribution"])
+    hypercube = sample_latin_hypercube(n_samples, len(par_priors))
 
-            list_of_starting_params[i][prior_dict["param_name"]] = quantile
+    # Transform each column of the hypercube to the quantiles of its parameter's prior
+    quantiles = np.empty((n_samples, len(par_priors)))
+    for j, prior_dict in enumerate(par_priors):
+        props = hypercube[:, j]
+        if prior_dict["distribution"] == "uniform":
+            quantiles[:, j] = prior_dict["distri_params"][0] + props * (
+                prior_dict["distri_params"][1] - prior_dict["distri_params"][0]
+            )
+        elif prior_dict["distribution"] == "lognormal":
+            mu = prior_dict["distri_params"][0]
+            sd = prior_dict["distri_params"][1]
+            quantiles[:, j] = [
+                math.exp(mu + math.sqrt(2) * sd * erfinv_value)
+                for erfinv_value in special.erfinv(2 * props - 1)
+            ]
+        elif prior_dict["distribution"] == "beta":
+            quantiles[:, j] = stats.beta.ppf(
+                props, prior_dict["distri_params"][0], prior_dict["distri_params"][1],
+            )
+        elif prior_dict["distribution"] == "gamma":
+            quantiles[:, j] = stats.gamma.ppf(
+                props, prior_dict["distri_params"][0], 0.0, prior_dict["distri_params"][1],
+            )
+        else:
+            raise_error_unsupported_prior(prior_dict["distribution"])
 
-    return list_of_starting_params
+    param_names = [prior_dict["param_name"] for prior_dict in par_priors]
+    return [dict(zip(param_names, sample)) for sample in quantiles.tolist()]
 
 
 def find_decent_starting_point(prior_dict):
@@ -71,6 +84,98 @@ def find_decent_starting_point(prior_dict):
     return x
 
 
+@jit(nopython=True, cache=True)
+def _xlogy(c, x):
+    """
+    c * log(x), taken as zero when c is zero so that the edges of the beta and gamma supports are handled as by scipy
+    """
+    if c == 0.0:
+        return 0.0
+    return c * math.log(x)
+
+
+@jit(nopython=True, cache=True)
+def uniform_log_pdf(x, lower, upper):
+    return -math.log(upper - lower)
+
+
+@jit(nopython=True, cache=True)
+def lognormal_log_pdf(x, mu, sd):
+    if x <= 0.0:
+        return -math.inf
+    log_x = math.log(x)
+    return -log_x - math.log(sd) - 0.5 * math.log(2.0 * math.pi) - (log_x - mu) ** 2 / (2.0 * sd ** 2)
+
+
+@jit(nopython=True, cache=True)
+def beta_log_pdf(x, a, b):
+    if x < 0.0 or x > 1.0:
+        return -math.inf
+    log_beta_function = math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+    return _xlogy(a - 1.0, x) + _xlogy(b - 1.0, 1.0 - x) - log_beta_function
+
+
+@jit(nopython=True, cache=True)
+def gamma_log_pdf(x, shape, scale):
+    if x < 0.0:
+        return -math.inf
+    return _xlogy(shape - 1.0, x) - x / scale - math.lgamma(shape) - shape * math.log(scale)
+
+
+# Log-PDFs written out in closed form and compiled, as scipy's argument checking dominates the cost of a single
+# evaluation. The position of each distribution in PRIOR_DISTRIBUTIONS is the code passed to sum_log_priors.
+PRIOR_DISTRIBUTIONS = ["uniform", "lognormal", "beta", "gamma"]
+LOG_PDF_FUNCTIONS = {
+    "uniform": uniform_log_pdf,
+    "lognormal": lognormal_log_pdf,
+    "beta": beta_log_pdf,
+    "gamma": gamma_log_pdf,
+}
+
+
+@jit(nopython=True, cache=True)
+def sum_log_priors(param_values, distribution_codes, distri_params):
+    """
+    Calculate the joint log-prior of a set of parameter values with independent priors
+    :param param_values: array of the parameter values
+    :param distribution_codes: array of the position of each parameter's distribution in PRIOR_DISTRIBUTIONS
+    :param distri_params: array with a row of the two distribution parameters for each parameter
+    :return: the sum of the log-PDFs
+    """
+    logp = 0.0
+    for i in range(param_values.shape[0]):
+        x = param_values[i]
+        code = distribution_codes[i]
+        if code == 0:
+            logp += uniform_log_pdf(x, distri_params[i, 0], distri_params[i, 1])
+        elif code == 1:
+            logp += lognormal_log_pdf(x, distri_params[i, 0], distri_params[i, 1])
+        elif code == 2:
+            logp += beta_log_pdf(x, distri_params[i, 0], distri_params[i, 1])
+        else:
+            logp += gamma_log_pdf(x, distri_params[i, 0], distri_params[i, 1])
+    return logp
+
+
+def get_log_prior_arrays(priors: List[Dict[str, Any]], param_names: List[str]):
+    """
+    Collect the priors of the requested parameters into the arrays used by sum_log_priors
+    :param priors: a list of dictionaries defining the prior distributions
+    :param param_names: the names of the parameters, in the order their values will be passed to sum_log_priors
+    :return: the distribution codes and the distribution parameters
+    """
+    prior_dicts = {prior_dict["param_name"]: prior_dict for prior_dict in priors}
+    distribution_codes = np.zeros(len(param_names), dtype=np.int64)
+    distri_params = np.zeros((len(param_names), 2))
+    for i, param_name in enumerate(param_names):
+        prior_dict = prior_dicts[param_name]
+        if prior_dict["distribution"] not in PRIOR_DISTRIBUTIONS:
+            raise_error_unsupported_prior(prior_dict["distribution"])
+        distribution_codes[i] = PRIOR_DISTRIBUTIONS.index(prior_dict["distribution"])
+        distri_params[i, :] = prior_dict["distri_params"]
+    return distribution_codes, distri_params
+
+
 def calculate_prior(prior_dict, x, log=True):
     """
     Calculate the log-prior value given the distribution details and the evaluation point
@@ -80,37 +185,44 @@ def calculate_prior(prior_dict, x, log=True):
         Whether to return the log-PDF of the PDF
     :return: log-PDF(x) or PDF(x)
     """
+    if log:
+        if prior_dict["distribution"] not in LOG_PDF_FUNCTIONS:
+            raise_error_unsupported_prior(prior_dict["distribution"])
+        y = LOG_PDF_FUNCTIONS[prior_dict["distribution"]](
+            float(x), *[float(param) for param in prior_dict["distri_params"]]
+        )
+    else:
+        y = calculate_prior_pdfs(prior_dict, x)
+    return float(y)
+
+
+def calculate_prior_pdfs(prior_dict, x_values):
+    """
+    Calculate the prior PDF at an array of evaluation points, all in one call to the distribution's PDF
+    :param prior_dict: distribution details
+    :param x_values: evaluation points
+    :return: array of PDF(x) for each evaluation point
+    """
     if prior_dict["distribution"] == "uniform":
-        if log:
-            y = math.log(1.0 / (prior_dict["distri_params"][1] - prior_dict["distri_params"][0]))
-        else:
-            y = 1.0 / (prior_dict["distri_params"][1] - prior_dict["distri_params"][0])
+        return np.full(
+            np.shape(x_values),
+            1.0 / (prior_dict["distri_params"][1] - prior_dict["distri_params"][0]),
+        )
     elif prior_dict["distribution"] == "lognormal":
         mu = prior_dict["distri_params"][0]
         sd = prior_dict["distri_params"][1]
-        if log:
-            y = stats.lognorm.logpdf(
-                x=x, s=sd, scale=math.exp(mu)
-            )  # see documentation of stats.lognorm for scale
-        else:
-            y = stats.lognorm.pdf(x=x, s=sd, scale=math.exp(mu))
+        # see documentation of stats.lognorm for scale
+        return stats.lognorm.pdf(x=x_values, s=sd, scale=math.exp(mu))
     elif prior_dict["distribution"] == "beta":
         a = prior_dict["distri_params"][0]
         b = prior_dict["distri_params"][1]
-        if log:
-            y = stats.beta.logpdf(x, a, b)
-        else:
-            y = stats.beta.pdf(x, a, b)
+        return stats.beta.pdf(x_values, a, b)
     elif prior_dict["distribution"] == "gamma":
         shape = prior_dict["distri_params"][0]
         scale = prior_dict["distri_params"][1]
-        if log:
-            y = stats.gamma.logpdf(x, shape, 0.0, scale)
-        else:
-            y = stats.gamma.pdf(x, shape, 0.0, scale)
+        return stats.gamma.pdf(x_values, shape, 0.0, scale)
     else:
-        raise_error_unsupported_prior()
-    return float(y)
+        raise_error_unsupported_prior(prior_dict["distribution"])
 
 
 def raise_error_unsupported_prior(distribution):
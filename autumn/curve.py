@@ -1,11 +1,13 @@
 """
 Sigmoidal and spline functions to generate cost coverage curves and historical input curves.
 """
+from functools import lru_cache
 from math import exp, tanh
 
 import numpy as np
 from scipy.interpolate import UnivariateSpline
 from scipy.integrate import quad
+from scipy.special import expit
 
 
 def numerical_integration(func, lower, upper):
@@ -20,6 +22,12 @@ def numerical_integration(func, lower, upper):
     return integral
 
 
+# Curves only depend on their scalar arguments, so identical requests share the same callable. Calibration builds
+# curves from sampled parameters, which rarely repeat, so the cache is bounded to keep it from growing over a run.
+CURVE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
 def make_sigmoidal_curve(y_low=0, y_high=1.0, x_start=0, x_inflect=0.5, multiplier=1.0):
 
     """
@@ -34,6 +42,7 @@ def make_sigmoidal_curve(y_low=0, y_high=1.0, x_start=0, x_inflect=0.5, multipli
         function that increases sigmoidally from 0 y_low to y_high
         the halfway point is at x_inflect on the x-axis and the slope
         at x_inflect goes to (0, y_low) if the multiplier is 1.
+        the function also accepts an array of x values, which is evaluated in one pass
     """
 
     amplitude = y_high - y_low
@@ -50,6 +59,10 @@ def make_sigmoidal_curve(y_low=0, y_high=1.0, x_start=0, x_inflect=0.5, multipli
 
     def curve(x):
         arg = b * (x_inflect - x)
+        if isinstance(x, np.ndarray):
+            # evaluate whole grids with the compiled logistic ufunc rather than element by element
+            return np.where(arg > 10.0, y_low, amplitude * expit(-arg) + y_low)
+
         # check for large values that will blow out exp
         if arg > 10.0:
             return y_low
@@ -58,6 +71,7 @@ def make_sigmoidal_curve(y_low=0, y_high=1.0, x_start=0, x_inflect=0.5, multipli
     return curve
 
 
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
 def make_two_step_curve(y_low, y_med, y_high, x_start, x_med, x_end):
     """
     The following function should no longer be relevant as scale_up_function with argument method=4 is equivalent.
@@ -464,10 +478,13 @@ def scale_up_function(
             )
             functions[i] = func
 
+        # x is sorted, so read the range bounds once rather than scanning the array at every call
+        x_min, x_max = float(x[0]), float(x[-1])
+
         def curve(t):
-            if t <= min(x):  # t is before the range defined by x -> takes the initial value
+            if t <= x_min:  # t is before the range defined by x -> takes the initial value
                 return y[0]
-            elif t >= max(x):  # t is after the range defined by x -> takes the last value
+            elif t >= x_max:  # t is after the range defined by x -> takes the last value
                 if intervention_end is not None:
                     if t >= t_intervention_start:
                         return curve_intervention(t)
@@ -48,9 +48,7 @@ def load_model_scenarios(
             conditions = [f"Scenario='{scenario_name}'", f"idx='{run_name}'"]
             outputs = out_db.query("outputs", conditions=conditions)
             derived_outputs = out_db.query("derived_outputs", conditions=conditions)
-            model = LoadedModel(
-                outputs=outputs.to_dict(), derived_outputs=derived_outputs.to_dict()
-            )
+            model = LoadedModel(outputs=outputs, derived_outputs=derived_outputs)
             idx = int(scenario_name.split("_")[1])
             chain_idx = int(run_name.split("_")[1])
             scenario = Scenario.load_from_db(idx, chain_idx, model, params=model_params)
@@ -266,20 +264,17 @@ def load_calibration_from_db(database_directory, n_burned_per_chain=0):
             outputs = out_database.query(
                 table_name="outputs", conditions=["idx='" + str(run_id) + "'"]
             )
-            output_dict = outputs.to_dict()
 
             if out_database.engine.dialect.has_table(out_database.engine, "derived_outputs"):
                 derived_outputs = out_database.query(
                     table_name="derived_outputs", conditions=["idx='" + str(run_id) + "'"],
                 )
-
-                derived_outputs_dict = derived_outputs.to_dict()
             else:
-                derived_outputs_dict = None
+                derived_outputs = None
             model_info_dict = {
                 "db_name": db_name,
                 "run_id": run_id,
-                "model": LoadedModel(output_dict, derived_outputs_dict),
+                "model": LoadedModel(outputs, derived_outputs),
                 "weight": weights[i],
             }
             models.append(model_info_dict)
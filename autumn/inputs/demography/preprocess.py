@@ -49,8 +49,9 @@ def read_life_expectancy_df(loc_df: pd.DataFrame):
     expect_df = expect_df.drop(columns=["country_code"])
 
     # Split period into start / end years
-    expect_df["start_year"] = expect_df["Period"].apply(lambda s: int(s.split("-")[0]))
-    expect_df["end_year"] = expect_df["Period"].apply(lambda s: int(s.split("-")[1]))
+    period_years_df = get_labels_df(expect_df["Period"], label_period, ("start_year", "end_year"))
+    expect_df["start_year"] = period_years_df["start_year"]
+    expect_df["end_year"] = period_years_df["end_year"]
     expect_df = expect_df.drop(columns=["Period"])
 
     # Unpivot data so each age group gets its own row
@@ -63,9 +64,7 @@ def read_life_expectancy_df(loc_df: pd.DataFrame):
         age = int(age_str.replace("+", ""))
         return [age, age + 4]
 
-    ages_df = pd.DataFrame(
-        [label_ages(age_str) for age_str in expect_df.variable], columns=("start_age", "end_age"),
-    )
+    ages_df = get_labels_df(expect_df.variable, label_ages, ("start_age", "end_age"))
     expect_df = expect_df.join(ages_df)
     expect_df = expect_df.drop(columns="variable")
 
@@ -99,8 +98,9 @@ def read_death_df(loc_df: pd.DataFrame):
     death_df = death_df.drop(columns=["country_code"])
 
     # Split period into start / end years
-    death_df["start_year"] = death_df["Period"].apply(lambda s: int(s.split("-")[0]))
-    death_df["end_year"] = death_df["Period"].apply(lambda s: int(s.split("-")[1]))
+    period_years_df = get_labels_df(death_df["Period"], label_period, ("start_year", "end_year"))
+    death_df["start_year"] = period_years_df["start_year"]
+    death_df["end_year"] = period_years_df["end_year"]
     death_df = death_df.drop(columns=["Period"])
 
     # Unpivot data so each age group gets its own row
@@ -115,9 +115,7 @@ def read_death_df(loc_df: pd.DataFrame):
         else:
             return [int(s) for s in age_str.split("-")]
 
-    ages_df = pd.DataFrame(
-        [label_ages(age_str) for age_str in death_df.variable], columns=("start_age", "end_age"),
-    )
+    ages_df = get_labels_df(death_df.variable, label_ages, ("start_age", "end_age"))
     death_df = death_df.join(ages_df)
     death_df = death_df.drop(columns="variable")
 
@@ -156,19 +154,16 @@ def read_crude_birth_df(loc_df: pd.DataFrame):
     # Unpivot data so each age group gets its own row
     birth_df = birth_df.melt(id_vars=["country", "iso3"], value_vars=birthrate_cols)
     birth_df.rename(columns={"value": "birth_rate"}, inplace=True)
-    variables = ((int(p) for p in s.split("-")) for s in birth_df.variable)
 
-    def label_times(start_time, end_time):
+    def label_times(period_str):
+        start_time, end_time = label_period(period_str)
         return (
             start_time,
             end_time,
             (start_time + end_time) / 2,
         )
 
-    times_df = pd.DataFrame(
-        [label_times(*times) for times in variables],
-        columns=("start_year", "end_year", "mean_year"),
-    )
+    times_df = get_labels_df(birth_df.variable, label_times, ("start_year", "end_year", "mean_year"))
     birth_df = birth_df.join(times_df)
     birth_df = birth_df.drop(columns="variable")
 
@@ -229,9 +224,7 @@ def read_population_df(loc_df: pd.DataFrame):
         else:
             return [int(s) for s in age_str.split("-")]
 
-    ages_df = pd.DataFrame(
-        [label_ages(age_str) for age_str in pop_df.variable], columns=("start_age", "end_age"),
-    )
+    ages_df = get_labels_df(pop_df.variable, label_ages, ("start_age", "end_age"))
     pop_df = pop_df.join(ages_df)
     pop_df = pop_df.drop(columns="variable")
 
@@ -246,6 +239,27 @@ def read_population_df(loc_df: pd.DataFrame):
     return pop_df
 
 
+def label_period(period_str):
+    """
+    Split a period such as "1950-1955" into its start and end years
+    """
+    return [int(year) for year in period_str.split("-")]
+
+
+def get_labels_df(variables: pd.Series, label_func, columns) -> pd.DataFrame:
+    """
+    Label every row of a melted dataframe from its variable.
+    There are only a few distinct variables, so each one is labelled once and the labels are looked up for each row.
+    """
+    distinct_variables = variables.unique()
+    labels_df = pd.DataFrame(
+        [label_func(variable) for variable in distinct_variables],
+        index=distinct_variables,
+        columns=columns,
+    )
+    return labels_df.loc[variables].reset_index(drop=True)
+
+
 def read_location_df():
     """
     Read UN country code mappings
@@ -2,6 +2,7 @@
 Preprocess static social mixing data so it is included in the inputs database
 """
 import os
+import multiprocessing
 
 import pandas as pd
 
@@ -27,24 +28,51 @@ SHEET_NAME_ISO3_MAP = {
 }
 
 
-def preprocess_social_mixing(input_db: Database, country_df):
-    for location in LOCATIONS:
-        for sheet_number, header_arg in SHEET_NUMBERS:
-            sheet_name = f"MUestimates_{location}_{sheet_number}.xlsx"
-            sheet_path = os.path.join(MIXING_DIRPATH, sheet_name)
-            xl = pd.ExcelFile(sheet_path)
-            sheet_names = xl.sheet_names
-            iso3s = [get_iso3(n, country_df) for n in sheet_names]
-            for idx, sheet_name in enumerate(sheet_names):
-                iso3 = iso3s[idx]
-                mix_df = pd.read_excel(xl, header=header_arg, sheet_name=sheet_name)
-                if sheet_number == "2":
-                    renames = {n - 1: f"X{n}" for n in range(1, 17)}
-                    mix_df.rename(columns=renames, inplace=True)
-
-                mix_df.insert(0, "location", [location for _ in range(len(mix_df))])
-                mix_df.insert(0, "iso3", [iso3 for _ in range(len(mix_df))])
-                input_db.dump_df("social_mixing", mix_df)
+def preprocess_social_mixing(input_db: Database, country_df, num_workers: int = None):
+    """
+    Store every country's mixing matrices from the social mixing workbooks.
+    The workbooks are independent, so they are parsed in worker processes where possible, and stored in order.
+    """
+    workbooks = [
+        (location, sheet_number, header_arg)
+        for location in LOCATIONS
+        for sheet_number, header_arg in SHEET_NUMBERS
+    ]
+    num_workers = min(num_workers or os.cpu_count(), len(workbooks))
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if num_workers < 2 or not can_fork:
+        for workbook in workbooks:
+            input_db.dump_df("social_mixing", read_mixing_workbook(*workbook, country_df))
+
+        return
+
+    with multiprocessing.get_context("fork").Pool(processes=num_workers) as pool:
+        workbook_results = [
+            pool.apply_async(read_mixing_workbook, (*workbook, country_df)) for workbook in workbooks
+        ]
+        for workbook_result in workbook_results:
+            input_db.dump_df("social_mixing", workbook_result.get())
+
+
+def read_mixing_workbook(location: str, sheet_number: str, header_arg, country_df):
+    """
+    Read every country's sheet from one social mixing workbook into a single dataframe.
+    """
+    sheet_name = f"MUestimates_{location}_{sheet_number}.xlsx"
+    sheet_path = os.path.join(MIXING_DIRPATH, sheet_name)
+    # Parse every country's sheet in one pass over the workbook, then combine them
+    sheet_dfs = pd.read_excel(sheet_path, header=header_arg, sheet_name=None)
+    mix_dfs = []
+    for country_sheet_name, mix_df in sheet_dfs.items():
+        if sheet_number == "2":
+            renames = {n - 1: f"X{n}" for n in range(1, 17)}
+            mix_df.rename(columns=renames, inplace=True)
+
+        mix_df.insert(0, "location", location)
+        mix_df.insert(0, "iso3", get_iso3(country_sheet_name, country_df))
+        mix_dfs.append(mix_df)
+
+    return pd.concat(mix_dfs, ignore_index=True)
 
 
 def get_iso3(sheet_name: str, country_df):
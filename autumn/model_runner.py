@@ -3,8 +3,10 @@ Build and run any AuTuMN model, storing the outputs
 """
 import os
 import logging
+import multiprocessing
 import yaml
 from datetime import datetime
+from types import SimpleNamespace
 
 
 from autumn import constants
@@ -12,13 +14,15 @@ from autumn.tool_kit.timer import Timer
 from autumn.tool_kit.serializer import serialize_model
 from autumn.tool_kit.scenarios import Scenario
 from autumn.tool_kit.utils import (
-    get_git_branch,
-    get_git_hash,
+    get_git_info,
 )
 from autumn.db.models import store_run_models
 
 logger = logging.getLogger(__name__)
 
+# Write YAML outputs with the libyaml emitter where it is available, which gives the same text much faster
+YamlDumper = getattr(yaml, "CDumper", yaml.Dumper)
+
 
 def build_model_runner(
     model_name: str, param_set_name: str, build_model, params: dict,
@@ -33,9 +37,11 @@ def build_model_runner(
     if not param_set_name:
         param_set_name = "main-model"
 
-    def run_model(run_scenarios=True):
+    def run_model(run_scenarios=True, num_workers=None):
         """
         Run the model, save the outputs.
+        The scenarios after the baseline only depend on the baseline outputs, so they are run in separate processes
+        when more than one worker is available (defaults to one per CPU).
         """
         logger.info(f"Running {model_name} {param_set_name}...")
 
@@ -51,19 +57,20 @@ def build_model_runner(
         # Save model parameters to output dir.
         param_path = os.path.join(output_dir, "params.yml")
         with open(param_path, "w") as f:
-            yaml.dump(params, f)
+            yaml.dump(params, f, Dumper=YamlDumper)
 
         # Save model run metadata to output dir.
         meta_path = os.path.join(output_dir, "meta.yml")
+        git_commit, git_branch = get_git_info()
         metadata = {
             "model_name": model_name,
             "param_set_name": param_set_name,
             "start_time": timestamp,
-            "git_branch": get_git_branch(),
-            "git_commit": get_git_hash(),
+            "git_branch": git_branch,
+            "git_commit": git_commit,
         }
         with open(meta_path, "w") as f:
-            yaml.dump(metadata, f)
+            yaml.dump(metadata, f, Dumper=YamlDumper)
 
         with Timer("Running model scenarios"):
             num_scenarios = 1 + len(params["scenarios"].keys())
@@ -83,10 +90,17 @@ def build_model_runner(
                 scenarios = scenarios[:1]
 
             # Run all the other scenarios
-            for scenario in scenarios[1:]:
-                scenario.run(base_model=baseline_model)
-                name = f"scenario-{scenario.idx}"
-                save_serialized_model(scenario.model, output_dir, name)
+            num_workers = min(num_workers or os.cpu_count(), len(scenarios) - 1)
+            can_fork = "fork" in multiprocessing.get_all_start_methods()
+            if num_workers > 1 and can_fork:
+                run_scenarios_in_processes(
+                    scenarios[1:], baseline_model, build_model, params, output_dir, num_workers
+                )
+            else:
+                for scenario in scenarios[1:]:
+                    scenario.run(base_model=baseline_model)
+                    name = f"scenario-{scenario.idx}"
+                    save_serialized_model(scenario.model, output_dir, name)
 
         with Timer("Saving model outputs to the database"):
             models = [s.model for s in scenarios]
@@ -95,10 +109,59 @@ def build_model_runner(
     return run_model
 
 
+# The model builder and parameters used by scenario worker processes.
+# These are inherited from the parent when the workers are forked, because model builders are often bound methods or
+# closures that cannot be pickled.
+_worker_build_model = None
+_worker_params = None
+_worker_output_dir = None
+
+
+def run_scenarios_in_processes(
+    scenarios, baseline_model, build_model, params: dict, output_dir: str, num_workers: int
+):
+    """
+    Run non-baseline scenarios in parallel worker processes, starting each from the baseline model's outputs.
+    The models hold functions that cannot be sent back from the workers, so each scenario's model is replaced by a
+    record of the outputs that are stored in the database.
+    """
+    base_model = SimpleNamespace(times=baseline_model.times, outputs=baseline_model.outputs)
+    with multiprocessing.get_context("fork").Pool(
+        processes=num_workers,
+        initializer=_init_scenario_worker,
+        initargs=(build_model, params, output_dir),
+    ) as pool:
+        scenario_results = [
+            pool.apply_async(_run_scenario_in_worker, (scenario.idx, base_model))
+            for scenario in scenarios
+        ]
+        for scenario, scenario_result in zip(scenarios, scenario_results):
+            scenario.model = scenario_result.get()
+
+
+def _init_scenario_worker(build_model, params: dict, output_dir: str):
+    global _worker_build_model, _worker_params, _worker_output_dir
+    _worker_build_model = build_model
+    _worker_params = params
+    _worker_output_dir = output_dir
+
+
+def _run_scenario_in_worker(scenario_idx: int, base_model: SimpleNamespace):
+    scenario = Scenario(_worker_build_model, scenario_idx, _worker_params)
+    scenario.run(base_model=base_model)
+    save_serialized_model(scenario.model, _worker_output_dir, f"scenario-{scenario.idx}")
+    return SimpleNamespace(
+        times=scenario.model.times,
+        outputs=scenario.model.outputs,
+        derived_outputs=scenario.model.derived_outputs,
+        compartment_names=scenario.model.compartment_names,
+    )
+
+
 def save_serialized_model(model, output_dir: str, name: str):
     model_path = os.path.join(output_dir, "models")
     os.makedirs(model_path, exist_ok=True)
     model_filepath = os.path.join(model_path, f"{name}.yml")
     model_data = serialize_model(model)
     with open(model_filepath, "w") as f:
-        yaml.dump(model_data, f)
+        yaml.dump(model_data, f, Dumper=YamlDumper)
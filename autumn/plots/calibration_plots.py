@@ -1,15 +1,23 @@
 import os
 import logging
+from concurrent import futures
+from functools import lru_cache
 
 from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 from scipy import stats
-from numpy import linspace
+from numpy import linspace, zeros_like
 
-from autumn.calibration.utils import calculate_prior, raise_error_unsupported_prior
+from autumn.calibration.utils import calculate_prior_pdfs, raise_error_unsupported_prior
 
 plt.style.use("ggplot")
 logger = logging.getLogger(__name__)
 
+# The number of prior plots to render and write at the same time
+PRIOR_PLOT_THREADS = 4
+
 
 def plot_all_priors(priors, directory):
     """
@@ -20,65 +28,104 @@ def plot_all_priors(priors, directory):
     logger.info("Plotting prior distributions")
     path = os.path.join(directory, "prior_plots")
     os.makedirs(path, exist_ok=True)
-    for i, prior_dict in enumerate(priors):
+    plotted_priors = []
+    for prior_dict in priors:
         if prior_dict["distribution"] == "lognormal":
             logger.error("Cannot plot prior distributions for lognormal.")
-            continue
-
-        fig, ax = plt.subplots()
-        x_range = workout_plot_x_range(prior_dict)
-        x_values = linspace(x_range[0], x_range[1], num=1000)
-        y_values = [calculate_prior(prior_dict, x, log=False) for x in x_values]
-        zeros = [0.0 for i in x_values]
-        plt.fill_between(x_values, y_values, zeros, color="cornflowerblue")
-
-        if "distri_mean" in prior_dict:
-            plt.axvline(x=prior_dict["distri_mean"], ymin=0, ymax=100*max(y_values), linewidth=1, color='red')
-        if "distri_ci" in prior_dict:
-            plt.axvline(x=prior_dict["distri_ci"][0], ymin=0, ymax=100*max(y_values), linewidth=.7, color='red')
-            plt.axvline(x=prior_dict["distri_ci"][1], ymin=0, ymax=100*max(y_values), linewidth=.7, color='red')
-
-
-        plt.xlabel(prior_dict["param_name"])
-        plt.ylabel("prior PDF")
-
-        # place a text box in upper left corner to indicate the prior details
-        props = dict(boxstyle="round", facecolor="dimgray", alpha=0.5)
-        textstr = (
-            prior_dict["distribution"]
-            + "\n("
-            + str(round(float(prior_dict["distri_params"][0]), 3))
-            + ", "
-            + str(round(float(prior_dict["distri_params"][1]), 3))
-            + ")"
-        )
-        ax.text(
-            0.05,
-            0.95,
-            textstr,
-            transform=ax.transAxes,
-            fontsize=14,
-            verticalalignment="top",
-            bbox=props,
-        )
+        else:
+            plotted_priors.append(prior_dict)
+
+    # The priors are shared between threads, which each draw on their own figure that is not shared with pyplot, so
+    # the figures can be rendered and written at the same time
+    prior_groups = [plotted_priors[i::PRIOR_PLOT_THREADS] for i in range(PRIOR_PLOT_THREADS)]
+    with futures.ThreadPoolExecutor(max_workers=PRIOR_PLOT_THREADS) as executor:
+        list(executor.map(lambda prior_group: plot_priors(prior_group, path), prior_groups))
+
 
-        plt.tight_layout()
+def plot_priors(priors, path):
+    """
+    Make the graphs of a group of prior distributions, reusing one figure that is cleared for each prior, and save
+    each graph as a PNG named after the parameter
+    :param priors: list of dictionaries
+    :param path: path to the prior plots directory
+    """
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    subplot_params = vars(fig.subplotpars).copy()
+    for prior_dict in priors:
+        # start each graph from the original layout, rather than the previous graph's tight layout
+        ax.clear()
+        fig.subplots_adjust(**subplot_params)
+        plot_prior(ax, prior_dict)
+        fig.tight_layout()
         filename = os.path.join(path, prior_dict["param_name"] + ".png")
-        plt.savefig(filename)
+        fig.savefig(filename)
+
+
+def plot_prior(ax, prior_dict):
+    """
+    Draw the graph of one prior distribution
+    :param ax: the axes to draw on
+    :param prior_dict: dictionary describing the prior
+    """
+    x_range = workout_plot_x_range(prior_dict)
+    x_values = linspace(x_range[0], x_range[1], num=1000)
+    y_values = calculate_prior_pdfs(prior_dict, x_values)
+    zeros = zeros_like(x_values)
+    ax.fill_between(x_values, y_values, zeros, color="cornflowerblue")
+
+    # draw the mean and credible interval bounds together, spanning the full height of the axes
+    line_xs, line_widths = [], []
+    if "distri_mean" in prior_dict:
+        line_xs.append(prior_dict["distri_mean"])
+        line_widths.append(1)
+    if "distri_ci" in prior_dict:
+        line_xs.extend(prior_dict["distri_ci"][:2])
+        line_widths.extend([.7, .7])
+    if line_xs:
+        lines = LineCollection(
+            [[(x, 0), (x, 1)] for x in line_xs],
+            linewidths=line_widths,
+            colors='red',
+            transform=ax.get_xaxis_transform(),
+        )
+        ax.add_collection(lines, autolim=False)
+        ax.update_datalim([(x, 0) for x in line_xs], updatey=False)
+
+    ax.set_xlabel(prior_dict["param_name"])
+    ax.set_ylabel("prior PDF")
+
+    # place a text box in upper left corner to indicate the prior details
+    props = dict(boxstyle="round", facecolor="dimgray", alpha=0.5)
+    param_0, param_1 = (round(float(p), 3) for p in prior_dict["distri_params"][:2])
+    textstr = f"{prior_dict['distribution']}\n({param_0}, {param_1})"
+    ax.text(
+        0.05,
+        0.95,
+        textstr,
+        transform=ax.transAxes,
+        fontsize=14,
+        verticalalignment="top",
+        bbox=props,
+    )
 
 
 def workout_plot_x_range(prior_dict):
-    if prior_dict["distribution"] == "uniform":
-        x_range = prior_dict["distri_params"]
-    elif prior_dict["distribution"] == "beta":
-        a = prior_dict["distri_params"][0]
-        b = prior_dict["distri_params"][1]
-        x_range = stats.beta.ppf([0.005, 0.995], a, b)
-    elif prior_dict["distribution"] == "gamma":
-        shape = prior_dict["distri_params"][0]
-        scale = prior_dict["distri_params"][1]
-        x_range = stats.gamma.ppf([0.005, 0.995], shape, 0.0, scale)
+    distri_params = prior_dict["distri_params"]
+    return get_plot_x_range(prior_dict["distribution"], float(distri_params[0]), float(distri_params[1]))
+
+
+# Priors often share a distribution and its parameters, so the plotting range is only found once for each of these
+@lru_cache(maxsize=None)
+def get_plot_x_range(distribution: str, param_0: float, param_1: float):
+    if distribution == "uniform":
+        x_range = (param_0, param_1)
+    elif distribution == "beta":
+        x_range = tuple(stats.beta.ppf([0.005, 0.995], param_0, param_1))
+    elif distribution == "gamma":
+        x_range = tuple(stats.gamma.ppf([0.005, 0.995], param_0, 0.0, param_1))
     else:
-        raise_error_unsupported_prior(prior_dict["distribution"])
+        raise_error_unsupported_prior(distribution)
 
     return x_range
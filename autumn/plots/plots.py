@@ -476,23 +476,28 @@ def plot_pop_distribution_by_stratum(
 ):
     for strata_name in strata:
         fig, axes, max_dims, n_rows, n_cols = plotter.get_figure()
-        previous_values = [0.0] * len(model.times)
+        stratum_idxs = []
+        stratum_values = []
         for stratum_idx, stratum in enumerate(model.all_stratifications[strata_name]):
-            colour = stratum_idx / len(model.all_stratifications[strata_name])
             key = f"distribution_of_strataX{strata_name}"
             try:
-                working_values = generated_outputs[key][stratum]
+                stratum_values.append(generated_outputs[key][stratum])
             except KeyError:
                 logger.error("No generated output found for %s", key)
                 continue
 
-            new_values = [
-                working + previous for working, previous in zip(working_values, previous_values)
-            ]
+            stratum_idxs.append(stratum_idx)
+
+        # Stack the strata on top of each other, with the upper edge of each band the running total of the strata
+        stratum_values = np.reshape(stratum_values, (len(stratum_idxs), len(model.times)))
+        upper_values = np.cumsum(stratum_values, axis=0)
+        lower_values = np.zeros(len(model.times))
+        for stratum_idx, new_values in zip(stratum_idxs, upper_values):
+            colour = stratum_idx / len(model.all_stratifications[strata_name])
             axes.fill_between(
-                model.times, previous_values, new_values, color=(colour, 0.0, 1 - colour),
+                model.times, lower_values, new_values, color=(colour, 0.0, 1 - colour),
             )
-            previous_values = new_values
+            lower_values = new_values
 
         axes.legend(model.all_stratifications[strata_name])
         plotter.save_figure(fig, filename=f"distribution_by_stratum_{strata_name}")
@@ -1,3 +1,4 @@
+import numpy
 from numpy import linspace
 
 from summer.model.strat_model import StratifiedModel
@@ -91,8 +92,9 @@ class PostProcessing:
           output of interest. With the example above, we are interested in individuals who have latent infection with a
           MDR strain.
         """
+        compartment_names = self.model.compartment_names
         for output in self.requested_outputs:
-            self.operations_to_perform[output] = {}
+            operations = self.operations_to_perform[output] = {}
             if output.startswith("prev"):
                 string_pre_among, string_post_among = output.split("among")
 
@@ -111,11 +113,11 @@ class PostProcessing:
                 numerator_conditions = string_pre_among.split("X")[1:-1]
 
                 # list all relevant compartments that should be included into the numerator or the denominator
-                self.operations_to_perform[output]["numerator_indices"] = []
+                numerator_indices = operations["numerator_indices"] = []
 
                 # indices to be added to the numerator ones to form the whole denominator
-                self.operations_to_perform[output]["denominator_extra_indices"] = []
-                for i_comp, compartment in enumerate(self.model.compartment_names):
+                denominator_extra_indices = operations["denominator_extra_indices"] = []
+                for i_comp, compartment in enumerate(compartment_names):
                     name_components = find_name_components(compartment)
                     is_in_denominator = True
 
@@ -130,29 +132,25 @@ class PostProcessing:
 
                     if is_in_denominator:
                         if all(category in compartment for category in numerator_conditions):
-                            self.operations_to_perform[output]["numerator_indices"].append(i_comp)
+                            numerator_indices.append(i_comp)
                         else:
-                            self.operations_to_perform[output]["denominator_extra_indices"].append(
-                                i_comp
-                            )
+                            denominator_extra_indices.append(i_comp)
 
             # population distribution across a particular requested stratum
             elif output.startswith("distribution_of_strata"):
 
                 # create dictionary keyed with the names of the strata within the stratification of interest
-                self.operations_to_perform[output]["compartment_indices"] = {}
+                compartment_indices = operations["compartment_indices"] = {}
                 stratification_of_interest = output.split("X")[1]
 
                 # populate with the indices of the compartment of interest
                 for stratum_name in self.model.all_stratifications[stratification_of_interest]:
-                    self.operations_to_perform[output]["compartment_indices"][stratum_name] = []
-                    for i_comp, compartment_name in enumerate(self.model.compartment_names):
-                        if stratification_of_interest + "_" + stratum_name in find_name_components(
-                            compartment_name
-                        ):
-                            self.operations_to_perform[output]["compartment_indices"][
-                                stratum_name
-                            ].append(i_comp)
+                    stratum = stratification_of_interest + "_" + stratum_name
+                    compartment_indices[stratum_name] = [
+                        i_comp
+                        for i_comp, compartment_name in enumerate(compartment_names)
+                        if stratum in find_name_components(compartment_name)
+                    ]
             else:
                 raise ValueError("only prevalence and distribution outputs are currently supported")
 
@@ -190,35 +188,30 @@ class PostProcessing:
         :param time_indices: the time index
         :return: the calculated value of the requested output at the requested time index
         """
+        # gather the model outputs at the requested times once, with one row per time and one column per compartment
+        time_outputs = self.model.outputs[list(time_indices)]
         if output.startswith("prev"):
-            out = []
-            for i_time in time_indices:
-                numerator = self.model.outputs[
-                    i_time, self.operations_to_perform[output]["numerator_indices"]
-                ].sum()
-                extra_for_denominator = self.model.outputs[
-                    i_time, self.operations_to_perform[output]["denominator_extra_indices"],
-                ].sum()
-                value = (
-                    numerator / (numerator + extra_for_denominator)
-                    if numerator + extra_for_denominator > 0.0
-                    else 0
-                )
-                if output in self.multipliers.keys():
-                    value *= self.multipliers[output]
-                out.append(value)
+            numerator = time_outputs[
+                :, self.operations_to_perform[output]["numerator_indices"]
+            ].sum(axis=1)
+            extra_for_denominator = time_outputs[
+                :, self.operations_to_perform[output]["denominator_extra_indices"]
+            ].sum(axis=1)
+            denominator = numerator + extra_for_denominator
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                values = numpy.where(denominator > 0.0, numerator / denominator, 0.0)
+            if output in self.multipliers.keys():
+                values *= self.multipliers[output]
+            out = list(values)
 
         elif output.startswith("distribution_of_strata"):
             out = {}
             for stratum in self.operations_to_perform[output]["compartment_indices"].keys():
-                out[stratum] = []
-                for i_time in time_indices:
-                    out[stratum].append(
-                        self.model.outputs[
-                            i_time,
-                            self.operations_to_perform[output]["compartment_indices"][stratum],
-                        ].sum()
-                    )
+                out[stratum] = list(
+                    time_outputs[
+                        :, self.operations_to_perform[output]["compartment_indices"][stratum]
+                    ].sum(axis=1)
+                )
 
         else:
             ValueError("output type not currently supported")
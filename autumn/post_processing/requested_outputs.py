@@ -98,22 +98,17 @@ class PrevalenceOutput(RequestedOutput):
                 else:
                     denominator_indices.append(comp_idx)
 
-        generated_output = []
-        for time_idx in time_indices:
-            numerator = model.outputs[time_idx, numerator_indices].sum()
-            extra_for_denominator = model.outputs[time_idx, denominator_indices].sum()
-            try:
-                value = numerator / (numerator + extra_for_denominator)
-            except ZeroDivisionError:
-                value = 0
+        # Gather the outputs at the requested times once, with one row per time and one column per compartment
+        time_outputs = model.outputs[list(time_indices)]
+        numerator = time_outputs[:, numerator_indices].sum(axis=1)
+        extra_for_denominator = time_outputs[:, denominator_indices].sum(axis=1)
+        generated_output = numerator / (numerator + extra_for_denominator)
 
-            output_str = self.to_str()
-            if output_str in multipliers.keys():
-                value *= multipliers[output_str]
+        output_str = self.to_str()
+        if output_str in multipliers.keys():
+            generated_output *= multipliers[output_str]
 
-            generated_output.append(value)
-
-        return generated_output
+        return list(generated_output)
 
 
 class StrataOutput(RequestedOutput):
@@ -153,11 +148,9 @@ class StrataOutput(RequestedOutput):
                 if self.stratum + "_" + stratum_name in name_components:
                     compartment_indices[stratum_name].append(i_comp)
 
+        time_outputs = model.outputs[list(time_indices)]
         out = {}
         for stratum in compartment_indices.keys():
-            out[stratum] = []
-            for i_time in time_indices:
-                value = model.outputs[i_time, compartment_indices[stratum]].sum()
-                out[stratum].append(value)
+            out[stratum] = list(time_outputs[:, compartment_indices[stratum]].sum(axis=1))
 
         return out
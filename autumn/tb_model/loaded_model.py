@@ -1,4 +1,4 @@
-import numpy
+import pandas
 
 
 class LoadedModel:
@@ -7,28 +7,28 @@ class LoadedModel:
     """
 
     def __init__(self, outputs, derived_outputs):
+        """
+        outputs and derived_outputs are tables of model outputs with one row per time, either as DataFrames or as the
+        dicts of columns produced by DataFrame.to_dict()
+        """
+        outputs_df = pandas.DataFrame(outputs)
         self.compartment_names = [
-            name for name in outputs.keys() if name not in ["idx", "Scenario", "times"]
+            name for name in outputs_df.columns if name not in ["idx", "Scenario", "times"]
         ]
 
-        self.outputs = numpy.column_stack(
-            [
-                list(column.values())
-                for name, column in outputs.items()
-                if name not in ["idx", "Scenario", "times"]
-            ]
-        )
-        self.derived_outputs = (
-            {
-                key: list(value.values())
-                for key, value in derived_outputs.items()
+        # Take all the compartment columns as one block, rather than converting each column separately
+        self.outputs = outputs_df[self.compartment_names].to_numpy()
+        if derived_outputs is not None:
+            derived_outputs_df = pandas.DataFrame(derived_outputs)
+            self.derived_outputs = {
+                key: derived_outputs_df[key].tolist()
+                for key in derived_outputs_df.columns
                 if key not in ["idx", "Scenario", "times"]
             }
-            if derived_outputs is not None
-            else None
-        )
+        else:
+            self.derived_outputs = None
 
-        self.times = list(outputs["times"].values())
+        self.times = outputs_df["times"].tolist()
         self.all_stratifications = {}
         # lateXagegroup_75Xclinical_sympt_non_hospital
         for compartment_name in self.compartment_names:
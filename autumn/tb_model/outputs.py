@@ -9,10 +9,7 @@ import autumn.post_processing as post_proc
 import matplotlib.pyplot as plt
 
 from ..constants import Compartment
-from autumn.tool_kit.utils import (
-    find_first_list_element_above,
-    element_wise_list_summation,
-)
+from autumn.tool_kit.utils import find_first_list_element_above
 from autumn.tb_model.flows import (
     get_incidence_connections,
     get_notifications_connections,
@@ -357,11 +354,11 @@ def sum_notifications_over_organ_diabetes(derived_outputs, locations, age_groups
     for i_loc, location in enumerate(locations):
         summed_notifications[location] = {}
         for age_group in age_groups:
-            summed_notifications[location][age_group] = [0.0] * n_times
+            # Accumulate in place into an array, rather than building a new list for each stratum added.
+            summed_notifications[location][age_group] = numpy.zeros(n_times)
             for organ in organs:
                 for diabetic in diabetes:
-                    summed_notifications[location][age_group] = element_wise_list_summation(
-                        summed_notifications[location][age_group],
+                    summed_notifications[location][age_group] += numpy.asarray(
                         derived_outputs[
                             "notificationsXage_"
                             + age_group
@@ -371,6 +368,6 @@ def sum_notifications_over_organ_diabetes(derived_outputs, locations, age_groups
                             + organ
                             + "Xlocation_"
                             + location
-                        ],
+                        ]
                     )
     return summed_notifications
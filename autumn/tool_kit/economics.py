@@ -17,23 +17,29 @@ def get_cost_from_coverage(
         unit_cost: Unit cost of the intervention
         popsize: Size of the population targeted by the intervention
         alpha: Steepness parameter determining the curve's shape
+    Any of the arguments may be arrays (e.g. over time), in which case the costs are returned as an array.
     Returns:
         The raw cost from the logistic function
     """
+    coverage, saturation, unit_cost, popsize = numpy.broadcast_arrays(
+        *(numpy.asarray(arg, dtype=float) for arg in (coverage, saturation, unit_cost, popsize))
+    )
 
-    # if unit cost or pop_size or coverage is null, return 0
-    if popsize == 0.0 or unit_cost == 0.0 or coverage == 0.0:
-        return 0.0
+    # if unit cost or pop_size or coverage is null, the cost is 0
+    is_null = (popsize == 0.0) | (unit_cost == 0.0) | (coverage == 0.0)
     # assert 0. <= coverage <= saturation, 'Coverage must satisfy 0 <= coverage <= saturation'
-    if coverage == saturation:
-        coverage = saturation - 1e-6
+    coverage = numpy.where(coverage == saturation, saturation - 1e-6, coverage)
 
     # logistic curve function code
-    a = saturation / (1.0 - 2.0 ** alpha)
-    b = 2.0 ** (alpha + 1.0) / (alpha * (saturation - a) * unit_cost * popsize)
-    return inflection_cost - 1.0 / b * numpy.log(
-        ((saturation - a) / (coverage - a)) ** (1.0 / alpha) - 1.0
-    )
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        a = saturation / (1.0 - 2.0 ** alpha)
+        b = 2.0 ** (alpha + 1.0) / (alpha * (saturation - a) * unit_cost * popsize)
+        cost = inflection_cost - 1.0 / b * numpy.log(
+            ((saturation - a) / (coverage - a)) ** (1.0 / alpha) - 1.0
+        )
+
+    cost = numpy.where(is_null, 0.0, cost)
+    return float(cost) if cost.ndim == 0 else cost
 
 
 def get_coverage_from_cost(
@@ -49,14 +55,25 @@ def get_coverage_from_cost(
         unit_cost: Unit cost of the intervention
         popsize: Size of the population targeted by the intervention
         alpha: Steepness parameter determining the curve's shape
+    Any of the arguments may be arrays (e.g. over time), in which case the coverages are returned as an array.
     Returns:
         The proportional coverage of the intervention given the spending
    """
+    spending, saturation, unit_cost, popsize = numpy.broadcast_arrays(
+        *(numpy.asarray(arg, dtype=float) for arg in (spending, saturation, unit_cost, popsize))
+    )
 
     # if cost is smaller thar c_inflection_cost, then the starting cost necessary to get coverage has not been reached
-    if popsize == 0.0 or unit_cost == 0.0 or spending == 0.0 or spending <= inflection_cost:
-        return 0.0
+    is_null = (
+        (popsize == 0.0) | (unit_cost == 0.0) | (spending == 0.0) | (spending <= inflection_cost)
+    )
+
+    with numpy.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a = saturation / (1.0 - 2.0 ** alpha)
+        b = 2.0 ** (alpha + 1.0) / (alpha * (saturation - a) * unit_cost * popsize)
+        coverage = a + (saturation - a) / (
+            (1.0 + numpy.exp((-b) * (spending - inflection_cost))) ** alpha
+        )
 
-    a = saturation / (1.0 - 2.0 ** alpha)
-    b = 2.0 ** (alpha + 1.0) / (alpha * (saturation - a) * unit_cost * popsize)
-    return a + (saturation - a) / ((1.0 + numpy.exp((-b) * (spending - inflection_cost))) ** alpha)
+    coverage = numpy.where(is_null, 0.0, coverage)
+    return float(coverage) if coverage.ndim == 0 else coverage
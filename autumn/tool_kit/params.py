@@ -10,6 +10,9 @@ from os import path
 from autumn.constants import APPS_PATH
 from autumn.tool_kit.utils import merge_dicts
 
+# Read parameter files with the libyaml parser where it is available, which builds the same data much faster
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_params(app_name: str, region_name: str):
     """
@@ -33,12 +36,12 @@ def load_params(app_name: str, region_name: str):
     # Load base param config
     base_yaml_path = path.join(param_path, "base.yml")
     with open(base_yaml_path, "r") as f:
-        base_params = yaml.safe_load(f)
+        base_params = yaml.load(f, Loader=YamlLoader)
 
     # Load app default param config
     default_param_path = path.join(app_param_dir, "default.yml")
     with open(default_param_path, "r") as f:
-        app_default_params = yaml.safe_load(f)
+        app_default_params = yaml.load(f, Loader=YamlLoader)
 
     default_params = merge_dicts(app_default_params, base_params)
 
@@ -53,7 +56,7 @@ def load_params(app_name: str, region_name: str):
         scenario_idx = int(fname.split("-")[-1].split(".")[0])
         yaml_path = path.join(app_param_dir, fname)
         with open(yaml_path, "r") as f:
-            scenarios[scenario_idx] = yaml.safe_load(f)
+            scenarios[scenario_idx] = yaml.load(f, Loader=YamlLoader)
 
     # By convention this is outside of the default params
     scenario_start_time = None
@@ -98,7 +101,8 @@ ARRAY_REQUEST_REGEX = r"^\w+\(-?\d\)$"
 
 
 def _update_params(params: dict, update_key: str, update_val) -> dict:
-    ps = deepcopy(params)
+    # Updates are made in place, update_params has already copied the parameters once for all of its updates.
+    ps = params
     keys = update_key.split(".")
     current_key, nested_keys = keys[0], keys[1:]
     is_arr_update = re.match(ARRAY_REQUEST_REGEX, current_key)
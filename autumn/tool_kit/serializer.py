@@ -1,3 +1,5 @@
+import numpy as np
+
 from summer.model import StratifiedModel
 
 
@@ -9,13 +11,13 @@ def serialize_model(model: StratifiedModel) -> dict:
     flow_implement = t_flows_df.implement.max()
     mask = t_flows_df["implement"] == flow_implement
     t_flows_imp_df = t_flows_df[mask]
-    t_flows = list(t_flows_imp_df.T.to_dict().values())
+    t_flows = t_flows_imp_df.to_dict("records")
 
     d_flows_df = model.death_flows
     flow_implement = d_flows_df.implement.max()
     mask = d_flows_df["implement"] == flow_implement
     d_flows_imp_df = d_flows_df[mask]
-    d_flows = list(d_flows_imp_df.T.to_dict().values())
+    d_flows = d_flows_imp_df.to_dict("records")
     return {
         "settings": {
             "entry_compartment": model.entry_compartment,
@@ -43,10 +45,5 @@ def serialize_model(model: StratifiedModel) -> dict:
 
 
 def serialize_params(ps):
-    params = {}
-    for k, v in ps.items():
-        try:
-            params[k] = v.tolist()
-        except:
-            params[k] = v
-    return params
+    # Convert NumPy arrays and scalars to the equivalent Python lists and numbers, leaving every other value as it is
+    return {k: v.tolist() if isinstance(v, (np.ndarray, np.generic)) else v for k, v in ps.items()}
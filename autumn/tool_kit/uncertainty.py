@@ -1,7 +1,5 @@
 import os
 import logging
-import multiprocessing
-from concurrent import futures
 from typing import List
 
 
@@ -101,63 +99,47 @@ def calculate_mcmc_uncertainty(weights_df: pd.DataFrame, quantiles: List[float])
     Calculate quantiles from a table of weighted values.
     See calc_mcmc_weighted_values for how these weights are calculated.
     """
-
-    # For a given time and output we want the weighted vcals
-
     output_names = weights_df.output_name.unique()
-    times = sorted(weights_df.times.unique())
     scenarios = weights_df.Scenario.unique()
     uncertainty_data = []
-    threads_args_list = []
     for scenario in scenarios:
+        scenario_df = weights_df[weights_df["Scenario"] == scenario]
         for output_name in output_names:
-            thread_args = (
-                scenario,
-                output_name,
-                times,
-                weights_df,
-                quantiles,
-                uncertainty_data,
-            )
-            threads_args_list.append(thread_args)
-
-    num_workers = multiprocessing.cpu_count() - 2
-    with futures.ThreadPoolExecutor(max_workers=num_workers) as ex:
-        fs = [ex.submit(calculate_quantiles, *args) for args in threads_args_list]
-        futures.wait(fs, timeout=None, return_when=futures.FIRST_EXCEPTION)
+            output_df = scenario_df[scenario_df["output_name"] == output_name]
+            if not output_df.empty:
+                uncertainty_data += calculate_quantiles(scenario, output_name, output_df, quantiles)
 
     uncertainty_df = pd.DataFrame(uncertainty_data)
     return uncertainty_df
 
 
 def calculate_quantiles(
-    scenario: str,
-    output_name: str,
-    times: List[int],
-    weights_df: pd.DataFrame,
-    quantiles: List[float],
-    uncertainty_data: List[dict],
-):
-    for time in times:
-        time_mask = weights_df["times"] == time
-        scenario_mask = weights_df["Scenario"] == scenario
-        output_mask = weights_df["output_name"] == output_name
-        mask = time_mask & scenario_mask & output_mask
-        masked_df = weights_df[mask]
-        if masked_df.empty:
-            continue
-
-        weighted_values = np.repeat(masked_df.value, masked_df.weight)
-        quantile_vals = np.quantile(weighted_values, quantiles)
-        for q_idx, q_value in enumerate(quantile_vals):
-            datum = {
-                "Scenario": scenario,
-                "type": output_name,
-                "time": time,
-                "quantile": quantiles[q_idx],
-                "value": q_value,
-            }
-            uncertainty_data.append(datum)
+    scenario: str, output_name: str, output_df: pd.DataFrame, quantiles: List[float],
+) -> List[dict]:
+    """
+    Calculate the quantiles of a single output of a single scenario at every time.
+    The weighted values are laid out as a (runs, times) array so the quantiles of all times are found in one call,
+    with runs that do not cover a given time left as NaN and ignored for that time.
+    """
+    values_by_run = output_df.pivot(index="idx", columns="times", values="value")
+    run_weights = output_df.groupby("idx")["weight"].first().loc[values_by_run.index]
+    weighted_values = np.repeat(
+        values_by_run.to_numpy(dtype=float), run_weights.to_numpy(dtype=int), axis=0
+    )
+    times = values_by_run.columns
+    has_values = ~np.isnan(weighted_values).all(axis=0)
+    quantile_vals = np.nanquantile(weighted_values[:, has_values], quantiles, axis=0).T
+    return [
+        {
+            "Scenario": scenario,
+            "type": output_name,
+            "time": time,
+            "quantile": quantile,
+            "value": q_value,
+        }
+        for time, time_quantiles in zip(times[has_values], quantile_vals)
+        for quantile, q_value in zip(quantiles, time_quantiles)
+    ]
 
 
 def run_idx_to_int(run_idx: str) -> int:
@@ -192,16 +174,18 @@ def export_mcmc_quantiles(
             if c_name[-2:] == "_0":
                 c_name = c_name[:-2]
             column_names.append(c_name)
-        out_table = pd.DataFrame(columns=column_names)
+        # Collect the table of each scenario, then join them all at once rather than growing the output table
+        sc_tables = []
         for sc_index in range(len(times)):
-            this_sc_table = pd.DataFrame(columns=column_names)
-            this_sc_table.times = times[sc_index]
-            this_sc_table.Scenario = ["S_" + str(sc_index)] * len(times[sc_index])
-            for i_quantile, q in enumerate(q_list):
-                c_name = column_names[i_quantile + 2]
-                this_sc_table[c_name] = quantiles[sc_index][:, i_quantile]
-            out_table = pd.concat([out_table, this_sc_table])
+            sc_columns = {
+                "times": times[sc_index],
+                "Scenario": ["S_" + str(sc_index)] * len(times[sc_index]),
+            }
+            for i_quantile, c_name in enumerate(column_names[2:]):
+                sc_columns[c_name] = quantiles[sc_index][:, i_quantile]
+            sc_tables.append(pd.DataFrame(sc_columns, columns=column_names))
 
+        out_table = pd.concat(sc_tables) if sc_tables else pd.DataFrame(columns=column_names)
         output_db.dump_df(output_name, out_table)
 
 
@@ -326,20 +310,23 @@ def compute_mcmc_output_quantiles(
 
         steps = int(t_max - t_min + 1)
         times = np.linspace(t_min, t_max, num=steps).tolist()
-        quantiles = np.zeros((len(times), 5))
-
-        for i_time, time in enumerate(times):
-            output_list = []
-            for i_chain in range(len(mcmc_tables)):
-                for run_id, w in weights[i_chain].items():
-                    mask = (
-                        (derived_output_tables[i_chain].idx == run_id)
-                        & (derived_output_tables[i_chain].times == time)
-                        & (derived_output_tables[i_chain].Scenario == scenario)
-                    )
-                    output_val = float(derived_output_tables[i_chain][output_name][mask])
-                    output_list += [output_val] * w
-            quantiles[i_time, :] = np.quantile(output_list, q_list)
+
+        # Stack the output of every weighted run into a (runs, times) array, so that the quantiles of all the
+        # time points are found together.
+        # Single precision is plenty for percentiles of model outputs and halves the size of the weighted stack,
+        # which grows with the number of accepted iterations.
+        run_outputs = []
+        run_weights = []
+        for i_chain in range(len(mcmc_tables)):
+            chain_df = derived_output_tables[i_chain]
+            scenario_df = chain_df[chain_df.Scenario == scenario]
+            output_by_run = scenario_df.pivot(index="idx", columns="times", values=output_name)
+            run_ids = list(weights[i_chain].keys())
+            run_outputs.append(output_by_run.loc[run_ids, times].to_numpy(dtype=np.float32))
+            run_weights.extend(weights[i_chain].values())
+
+        weighted_outputs = np.repeat(np.concatenate(run_outputs), run_weights, axis=0)
+        quantiles = np.quantile(weighted_outputs, q_list, axis=0).T
 
         quantiles_by_sc.append(quantiles)
         times_by_sc.append(times)
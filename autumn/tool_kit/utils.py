@@ -52,24 +52,33 @@ def get_git_hash():
     """
     Return the current commit hash, or an empty string.
     """
-    return run_command("git rev-parse HEAD").strip()
+    return run_command(["git", "rev-parse", "HEAD"]).strip()
 
 
 def get_git_branch():
     """
     Return the current git branch, or an empty string
     """
-    return run_command("git rev-parse --abbrev-ref HEAD").strip()
+    return run_command(["git", "rev-parse", "--abbrev-ref", "HEAD"]).strip()
+
+
+def get_git_info():
+    """
+    Return the current commit hash and git branch, or empty strings, from a single git process.
+    """
+    info = run_command(["git", "rev-parse", "HEAD", "--abbrev-ref", "HEAD"]).split()
+    return tuple(info) if len(info) == 2 else ("", "")
 
 
 def run_command(cmds):
     """
-    Run a process and retun the stdout.
+    Run a process from a list of its arguments, without a shell, and retun the stdout.
+    Failures return an empty string, so the process's error output is discarded rather than printed.
     """
     try:
-        result = sp.run(cmds, shell=True, check=True, stdout=sp.PIPE, encoding="utf-8")
+        result = sp.run(cmds, check=True, stdout=sp.PIPE, stderr=sp.DEVNULL, encoding="utf-8")
         return result.stdout
-    except sp.CalledProcessError:
+    except (sp.CalledProcessError, OSError):
         return ""
 
 
@@ -279,7 +288,8 @@ def normalise_sequence(input_sequence):
     Normalise a list or tuple to produce a tuple with values representing the proportion of each to the total of the
     input sequence.
     """
-    return (i_value / sum(input_sequence) for i_value in input_sequence)
+    total = sum(input_sequence)
+    return (i_value / total for i_value in input_sequence)
 
 
 def convert_list_contents_to_int(input_list):
@@ -1,25 +1,23 @@
 import sys
 
+import pandas as pd
+
 
 def main():
 
     csv_file = sys.argv[1] # reads the input file
 
     output_csv = "output_mcmc.csv"
-    output_writer = open(output_csv,"w") # open output file for writing
-
-    lines = [line.strip() for line in open(csv_file,"r").readlines()] # parsing lines to remove the extra brake line character
-    line2print = lines[0]
-    for i in range(0,len(lines)):
-        accept = lines[i].split(',')[-1]
-        if accept == "1":
-            line2print = lines[i]
-            output_writer.write(line2print + "\n")
-        else:
-            output_writer.write(line2print + "\n")
-
-    output_writer.close() # close output file
-    
+
+    # read every field as text, so that values are written back exactly as they appear in the input file
+    mcmc_df = pd.read_csv(csv_file, dtype=str, keep_default_na=False)
+
+    # each rejected run repeats the last accepted run, runs before the first acceptance repeat the header
+    is_accepted = mcmc_df.iloc[:, -1].str.strip() == "1"
+    header = pd.Series(mcmc_df.columns, index=mcmc_df.columns)
+    output_df = mcmc_df.where(is_accepted, axis=0).ffill().fillna(header)
+    output_df.to_csv(output_csv, index=False)
+
     return True
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
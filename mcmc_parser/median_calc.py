@@ -9,15 +9,23 @@ def main():
 
 	columns2evaluate = [column for column in df.columns if column not in ['idx','Scenario','accept']] # remove unnecessary features
 
-	for column in columns2evaluate:
+	# evaluate every column together, rather than slicing the dataframe for each statistic
+	values = df[columns2evaluate].to_numpy(dtype=float)
+	means = np.mean(values, axis=0)
+	lower_cis, upper_cis = st.t.interval(0.95, len(values)-1, loc=means, scale=st.sem(values, axis=0))
+	medians = np.median(values, axis=0)
+	stds = np.std(values, axis=0)
+	quartiles = np.percentile(values, [25, 50, 75], axis=0)
+
+	for i_column, column in enumerate(columns2evaluate):
 		print("Column:\t{}".format(column))
-		print("Mean:\t{}".format(np.mean(df[column])))
-		print("95% CI {}".format(st.t.interval(0.95, len(df[column])-1, loc=np.mean(df[column]), scale=st.sem(df[column]))))
-		print("Median:\t{}".format(np.median(df[column])))
-		print("STD:\t{}".format(np.std(df[column])))
-		print("25%:\t{}".format(np.percentile(df[column],25)))
-		print("50%:\t{}".format(np.percentile(df[column],50)))
-		print("75%:\t{}".format(np.percentile(df[column],75)))
+		print("Mean:\t{}".format(means[i_column]))
+		print("95% CI {}".format((lower_cis[i_column], upper_cis[i_column])))
+		print("Median:\t{}".format(medians[i_column]))
+		print("STD:\t{}".format(stds[i_column]))
+		print("25%:\t{}".format(quartiles[0, i_column]))
+		print("50%:\t{}".format(quartiles[1, i_column]))
+		print("75%:\t{}".format(quartiles[2, i_column]))
 		print("\n")
 	return True
 	
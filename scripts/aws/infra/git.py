@@ -1,26 +1,110 @@
+import os
 import subprocess as sp
+from functools import lru_cache
 
 
+# HEAD only changes when we check out a branch, which clears these caches, so it is only read once otherwise
+@lru_cache(maxsize=1)
 def get_commit_hash():
-    return get_stdout(["git rev-parse HEAD"])
+    head = read_head()
+    if head is None:
+        return get_stdout(["git", "rev-parse", "HEAD"])
 
+    git_dir, ref = head
+    if not ref:
+        # HEAD is detached, so it holds the commit hash itself
+        return read_ref(git_dir, "HEAD")
 
+    return read_ref(git_dir, ref) or get_stdout(["git", "rev-parse", "HEAD"])
+
+
+@lru_cache(maxsize=1)
 def get_branch():
-    return get_stdout(["git rev-parse --abbrev-ref HEAD"])
+    head = read_head()
+    if head is None:
+        return get_stdout(["git", "rev-parse", "--abbrev-ref", "HEAD"])
+
+    _, ref = head
+    # git reports a detached HEAD as "HEAD"
+    return ref.replace("refs/heads/", "", 1) if ref else "HEAD"
 
 
 def set_new_branch(branch_name):
-    get_stdout([f"git checkout -b {branch_name}"])
+    get_stdout(["git", "checkout", "-b", branch_name])
+    clear_head_cache()
 
 
 def set_branch(branch_name):
-    get_stdout([f"git checkout {branch_name}"])
+    get_stdout(["git", "checkout", branch_name])
+    clear_head_cache()
+
+
+def clear_head_cache():
+    get_commit_hash.cache_clear()
+    get_branch.cache_clear()
 
 
 def push_new_branch(branch_name):
-    get_stdout([f"git push -u origin {branch_name}"])
+    get_stdout(["git", "push", "-u", "origin", branch_name])
 
 
 def get_stdout(cmd):
-    proc = sp.run(cmd, shell=True, check=True, stdout=sp.PIPE, encoding="utf-8")
+    # Run the command's arguments directly, without starting a shell to parse them
+    proc = sp.run(cmd, check=True, stdout=sp.PIPE, encoding="utf-8")
     return proc.stdout.strip()
+
+
+def find_git_dir():
+    """
+    Returns the .git directory of the repository containing the working directory, searching upwards as git does,
+    or None if there is no such directory (eg. a worktree, where .git is a file)
+    """
+    path = os.getcwd()
+    while True:
+        git_dir = os.path.join(path, ".git")
+        if os.path.isdir(git_dir):
+            return git_dir
+        elif os.path.exists(git_dir):
+            return None
+
+        parent_path = os.path.dirname(path)
+        if parent_path == path:
+            return None
+
+        path = parent_path
+
+
+def read_head():
+    """
+    Reads HEAD from the repository files, rather than starting a git process.
+    Returns the .git directory and the ref that HEAD points to (empty if HEAD is detached), or None if the
+    repository cannot be read directly.
+    """
+    git_dir = find_git_dir()
+    if not git_dir:
+        return None
+
+    with open(os.path.join(git_dir, "HEAD")) as f:
+        head = f.readline().strip()
+
+    return git_dir, head[len("ref: ") :] if head.startswith("ref: ") else ""
+
+
+def read_ref(git_dir, ref):
+    """
+    Returns the commit hash of a ref from its loose ref file or the packed refs, or an empty string if it is in neither.
+    """
+    ref_path = os.path.join(git_dir, ref)
+    if os.path.isfile(ref_path):
+        with open(ref_path) as f:
+            return f.readline().strip()
+
+    packed_refs_path = os.path.join(git_dir, "packed-refs")
+    if os.path.isfile(packed_refs_path):
+        with open(packed_refs_path) as f:
+            for line in f:
+                commit_hash, _, packed_ref = line.strip().partition(" ")
+                if packed_ref == ref:
+                    return commit_hash
+
+    return ""
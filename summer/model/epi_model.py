@@ -1,9 +1,12 @@
 import copy
 import logging
+from bisect import bisect_left
 
 import matplotlib.pyplot
 import numpy as np
 import pandas as pd
+from numba import jit
+from scipy.sparse import csr_matrix
 
 from ..constants import (
     Compartment,
@@ -216,7 +219,9 @@ class EpiModel:
         """
         flow["implement"] = flow.get("implement", len(self.all_stratifications))
         flow_data = {key: value for key, value in flow.items() if key != "function"}
-        self.transition_flows = self.transition_flows.append(flow_data, ignore_index=True)
+        self.transition_flows = pd.concat(
+            [self.transition_flows, pd.DataFrame([flow_data])], ignore_index=True
+        )
         if flow["type"] == Flow.CUSTOM:
             idx = self.transition_flows.shape[0] - 1
             self.customised_flow_functions[idx] = flow["function"]
@@ -226,7 +231,7 @@ class EpiModel:
         Add a death flow to the model's flows.
         """
         flow["implement"] = flow.get("implement", len(self.all_stratifications))
-        self.death_flows = self.death_flows.append(flow, ignore_index=True)
+        self.death_flows = pd.concat([self.death_flows, pd.DataFrame([flow])], ignore_index=True)
 
     def setup_default_parameters(self):
         """
@@ -276,6 +281,90 @@ class EpiModel:
         # Create mapping from compartment name to index.
         self.compartment_idx_lookup = {name: idx for idx, name in enumerate(self.compartment_names)}
 
+        # Store the compartment indices that each flow connects, indexed by flow row.
+        # Flows left over from earlier stratification rounds refer to compartments that no longer exist, so get -1.
+        self.transition_origin_idxs = np.array(
+            [self.compartment_idx_lookup.get(name, -1) for name in self.transition_flows.origin],
+            dtype=int,
+        )
+        self.transition_target_idxs = np.array(
+            [self.compartment_idx_lookup.get(name, -1) for name in self.transition_flows.to],
+            dtype=int,
+        )
+        self.death_origin_idxs = np.array(
+            [self.compartment_idx_lookup.get(name, -1) for name in self.death_flows.origin],
+            dtype=int,
+        )
+        self.implemented_death_origin_idxs = self.death_origin_idxs[
+            list(self.death_indices_to_implement)
+        ]
+        self.all_compartment_idxs = np.arange(len(self.compartment_names))
+
+        # Split the flows to implement into customised flows and those proportional to their origin compartment size,
+        # which can be applied together by the compiled flow kernel.
+        self.custom_flow_indices = []
+        self.linear_flow_indices = []
+        for n_flow in self.transition_indices_to_implement:
+            if self.transition_flows_dict["type"][n_flow] == Flow.CUSTOM:
+                self.custom_flow_indices.append(n_flow)
+            else:
+                self.linear_flow_indices.append(n_flow)
+
+        self.linear_flow_origin_idxs = self.transition_origin_idxs[self.linear_flow_indices]
+        self.linear_flow_target_idxs = self.transition_target_idxs[self.linear_flow_indices]
+
+        # Record which flows are transmission flows, so the flow type strings are not compared at every time step.
+        self.infection_frequency_flows = {
+            n_flow
+            for n_flow in self.linear_flow_indices
+            if self.transition_flows_dict["type"][n_flow] == Flow.INFECTION_FREQUENCY
+        }
+        self.infection_density_flows = {
+            n_flow
+            for n_flow in self.linear_flow_indices
+            if self.transition_flows_dict["type"][n_flow] == Flow.INFECTION_DENSITY
+        }
+
+        # Record the parameter of each linear flow and the positions of the transmission flows among the linear flows,
+        # so that the rates of all the linear flows can be found together at each time step.
+        self.linear_flow_parameters = [
+            self.transition_flows_dict["parameter"][n_flow] for n_flow in self.linear_flow_indices
+        ]
+        self.linear_density_positions = np.array(
+            [
+                position
+                for position, n_flow in enumerate(self.linear_flow_indices)
+                if n_flow in self.infection_density_flows
+            ],
+            dtype=int,
+        )
+        self.linear_frequency_positions = np.array(
+            [
+                position
+                for position, n_flow in enumerate(self.linear_flow_indices)
+                if n_flow in self.infection_frequency_flows
+            ],
+            dtype=int,
+        )
+
+        # Record the name stems and name components of each flow's compartments, so output requests can be matched
+        # to their flows without splitting every compartment name again for each output.
+        self.transition_implemented = (
+            self.transition_flows.implement.to_numpy() == len(self.all_stratifications)
+        )
+        self.transition_origin_stems = np.array(
+            [find_stem(name) for name in self.transition_flows.origin], dtype=object
+        )
+        self.transition_target_stems = np.array(
+            [find_stem(name) for name in self.transition_flows.to], dtype=object
+        )
+        self.transition_origin_components = [
+            set(find_name_components(name)) for name in self.transition_flows.origin
+        ]
+        self.transition_target_components = [
+            set(find_name_components(name)) for name in self.transition_flows.to
+        ]
+
     def find_all_infectious_indices(self):
         """
         find all the compartment names that begin with one of the requested infectious compartments
@@ -333,7 +422,12 @@ class EpiModel:
             return self.apply_all_flow_types_to_odes(compartment_values, time)
 
         self.outputs = solve_ode(
-            integration_type, ode_func, np.array(self.compartment_values), self.times, solver_args,
+            integration_type,
+            ode_func,
+            np.array(self.compartment_values),
+            self.times,
+            solver_args,
+            jac_func=self.get_flow_jacobian,
         )
 
         # Check that all compartment values are >= 0
@@ -342,8 +436,7 @@ class EpiModel:
 
         # Collate outputs to be calculated post-integration that are not just compartment sizes.
         self.calculate_post_integration_connection_outputs()
-        for death_output in self.death_output_categories:
-            self.calculate_post_integration_death_outputs(death_output)
+        self.calculate_post_integration_death_outputs()
         self.calculate_post_integration_function_outputs()
 
     def apply_all_flow_types_to_odes(self, compartment_values, time):
@@ -372,6 +465,77 @@ class EpiModel:
         flow_rates = self.apply_change_rates(flow_rates, compartment_values, time)
         return flow_rates
 
+    def get_flow_jacobian(self, compartment_values, time):
+        """
+        find the Jacobian of the ode equations with respect to the compartment sizes, for use by implicit solvers
+        each flow is proportional to the size of its origin compartment, so its per-capita rate enters the origin's
+            column, with the force of infection held at its current value
+        customised flows and strata change flows are not differentiated, which only affects the convergence of the
+            solver's Newton iterations and not the accuracy of the solution
+
+        :param compartment_values: np.ndarray
+            working values of the compartment sizes
+        :param time: float
+            current integration time
+        :return: scipy.sparse.csr_matrix
+            sparse square matrix of the derivative of each compartment's flow rate (rows) with respect to each
+                compartment's size (columns), with non-zero entries only where flows connect compartments
+        """
+        self.prepare_time_step(time)
+        self.update_tracked_quantities(compartment_values)
+        n_compartments = len(self.compartment_names)
+
+        # each flow moves its per-capita rate out of the origin's diagonal and into the target's row
+        flow_rates = self.get_linear_flow_rates(time)
+        rows = [self.linear_flow_origin_idxs, self.linear_flow_target_idxs]
+        columns = [self.linear_flow_origin_idxs, self.linear_flow_origin_idxs]
+        values = [-flow_rates, flow_rates]
+
+        # per-capita death rates, from both infection-related and population-wide deaths
+        get_parameter_value = self.get_parameter_value
+        get_compartment_death_rate = self.get_compartment_death_rate
+        death_rates = np.array(
+            [get_compartment_death_rate(compartment, time) for compartment in self.compartment_names],
+            dtype=float,
+        )
+        death_parameters = self.death_flows_dict["parameter"]
+        np.add.at(
+            death_rates,
+            self.implemented_death_origin_idxs,
+            [
+                get_parameter_value(death_parameters[n_flow], time)
+                for n_flow in self.death_indices_to_implement
+            ],
+        )
+        compartment_idxs = np.arange(n_compartments)
+        rows.append(compartment_idxs)
+        columns.append(compartment_idxs)
+        values.append(-death_rates)
+
+        # births are split across the entry compartments in proportion to total deaths or total population,
+        # so only the entry compartments' rows are filled
+        if self.birth_approach == BirthApproach.REPLACE_DEATHS:
+            self.tracked_quantities["total_deaths"] = 1.0
+            births_per_death = self.apply_birth_rate(
+                np.zeros(n_compartments), compartment_values, time
+            )
+            birth_derivatives = np.outer(births_per_death, death_rates)
+        elif self.birth_approach == BirthApproach.ADD_CRUDE:
+            births = self.apply_birth_rate(np.zeros(n_compartments), compartment_values, time)
+            birth_derivatives = np.outer(births / sum(compartment_values), np.ones(n_compartments))
+        else:
+            birth_derivatives = np.zeros((0, n_compartments))
+        entry_idxs = np.flatnonzero(birth_derivatives.any(axis=1))
+        rows.append(np.repeat(entry_idxs, n_compartments))
+        columns.append(np.tile(compartment_idxs, len(entry_idxs)))
+        values.append(birth_derivatives[entry_idxs].ravel())
+
+        # duplicate entries are summed when the matrix is assembled
+        return csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(n_compartments, n_compartments),
+        )
+
     def prepare_time_step(self, _time):
         """
         Perform any tasks needed for execution of each integration time step
@@ -390,57 +554,102 @@ class EpiModel:
 
         :parameters and return: see previous method apply_all_flow_types_to_odes
         """
-        for n_flow in self.transition_indices_to_implement:
+        flow_rates = np.asarray(flow_rates, dtype=float)
+
+        # Apply all flows that are proportional to the size of their origin compartment in one compiled pass
+        linear_flow_rates = self.get_linear_flow_rates(time)
+        apply_linear_flows(
+            flow_rates,
+            np.asarray(compartment_values, dtype=float),
+            linear_flow_rates,
+            self.linear_flow_origin_idxs,
+            self.linear_flow_target_idxs,
+        )
+
+        for n_flow in self.custom_flow_indices:
             # Find the net flow between compartments
             net_flow = self.find_net_transition_flow(n_flow, time, compartment_values)
 
             # Update equations with transition flows between compartments
-            origin_name = self.transition_flows_dict["origin"][n_flow]
-            target_name = self.transition_flows_dict["to"][n_flow]
-            origin_idx = self.compartment_idx_lookup[origin_name]
-            target_idx = self.compartment_idx_lookup[target_name]
-            flow_rates[origin_idx] -= net_flow
-            flow_rates[target_idx] += net_flow
+            flow_rates[self.transition_origin_idxs[n_flow]] -= net_flow
+            flow_rates[self.transition_target_idxs[n_flow]] += net_flow
 
         # return flow rates
         return flow_rates
 
-    def find_net_transition_flow(self, n_flow, time, compartment_values):
+    def get_transition_flow_rate(self, n_flow, time):
         """
-        common code to finding transition flows during and after integration packaged into single function
+        find the per-capita rate of a transition flow that is proportional to the size of its origin compartment, as
+            the parameter value multiplied by the "infectious population" (which equals one for non-infection-related
+            flows)
 
         :param n_flow: int
             row of interest in transition flow dataframe
         :param time: float
             time step, which may be time during integration or post-integration time point of interest
-        :param compartment_values: list
-            list of current compartment sizes
         :return: float
-            net transition between the two compartments being considered
+            rate at which the origin compartment transitions to the destination compartment
         """
-
-        # find adjusted parameter value
-        parameter = self.transition_flows_dict["parameter"][n_flow]
-        parameter_value = self.get_parameter_value(parameter, time)
+        parameter_value = self.get_parameter_value(
+            self.transition_flows_dict["parameter"][n_flow], time
+        )
 
         # the flow is null if the parameter is null
         if parameter_value == 0.0:
             return 0.0
 
-        # find from compartment and the "infectious population" (which equals one for non-infection-related flows)
-        infectious_population_factor = self.find_infectious_multiplier(n_flow)
+        return parameter_value * self.find_infectious_multiplier(n_flow)
 
-        # find the index of the origin or from compartment
-        origin_name = self.transition_flows_dict["origin"][n_flow]
-        origin_idx = self.compartment_idx_lookup[origin_name]
+    def get_linear_flow_rates(self, time):
+        """
+        find the per-capita rates of all the flows that are proportional to the size of their origin compartment
+            together, equivalent to calling get_transition_flow_rate for each of them
+
+        :param time: float
+            current integration time
+        :return: np.ndarray
+            rates of the flows in self.linear_flow_indices, in the same order
+        """
+        get_parameter_value = self.get_parameter_value
+        parameter_values = np.array(
+            [get_parameter_value(parameter, time) for parameter in self.linear_flow_parameters],
+            dtype=float,
+        )
+        linear_flow_rates = parameter_values * self.find_linear_flow_multipliers()
+
+        # the flow is null if the parameter is null, whatever the infectious multiplier
+        linear_flow_rates[parameter_values == 0.0] = 0.0
+        return linear_flow_rates
+
+    def find_net_transition_flow(self, n_flow, time, compartment_values):
+        """
+        common code to finding transition flows during and after integration packaged into single function
+
+        :param n_flow: int
+            row of interest in transition flow dataframe
+        :param time: float
+            time step, which may be time during integration or post-integration time point of interest
+        :param compartment_values: list
+            list of current compartment sizes
+        :return: float
+            net transition between the two compartments being considered
+        """
 
         # implement flows according to whether customised or standard/infection-related
         flow_type = self.transition_flows_dict["type"][n_flow]
         if flow_type == Flow.CUSTOM:
+            parameter = self.transition_flows_dict["parameter"][n_flow]
+            parameter_value = self.get_parameter_value(parameter, time)
+
+            # the flow is null if the parameter is null
+            if parameter_value == 0.0:
+                return 0.0
+
             custom_flow_func = self.customised_flow_functions[n_flow]
             return parameter_value * custom_flow_func(self, n_flow, time, compartment_values)
         else:
-            return parameter_value * compartment_values[origin_idx] * infectious_population_factor
+            origin_idx = self.transition_origin_idxs[n_flow]
+            return self.get_transition_flow_rate(n_flow, time) * compartment_values[origin_idx]
 
     def apply_compartment_death_flows(self, flow_rates, compartment_values, time):
         """
@@ -448,13 +657,27 @@ class EpiModel:
 
         :parameters and return: see previous method apply_all_flow_types_to_odes
         """
-        for n_flow in self.death_indices_to_implement:
-            net_flow = self.find_net_infection_death_flow(n_flow, time, compartment_values)
-            origin_name = self.death_flows_dict["origin"][n_flow]
-            origin_idx = self.compartment_idx_lookup[origin_name]
-            flow_rates[origin_idx] -= net_flow
-            if "total_deaths" in self.tracked_quantities:
-                self.tracked_quantities["total_deaths"] += net_flow
+        flow_rates = np.asarray(flow_rates, dtype=float)
+
+        # Remove all the death flows from their origin compartments in one compiled pass
+        death_parameters = self.death_flows_dict["parameter"]
+        get_parameter_value = self.get_parameter_value
+        death_rates = np.array(
+            [
+                get_parameter_value(death_parameters[n_flow], time)
+                for n_flow in self.death_indices_to_implement
+            ],
+            dtype=float,
+        )
+        total_deaths = apply_death_flows(
+            flow_rates,
+            np.asarray(compartment_values, dtype=float),
+            death_rates,
+            self.implemented_death_origin_idxs,
+        )
+
+        if "total_deaths" in self.tracked_quantities:
+            self.tracked_quantities["total_deaths"] += total_deaths
 
         return flow_rates
 
@@ -469,9 +692,7 @@ class EpiModel:
         :param compartment_values: list
             list of current compartment sizes
         """
-        origin_name = self.death_flows_dict["origin"][_n_flow]
-        origin_idx = self.compartment_idx_lookup[origin_name]
-
+        origin_idx = self.death_origin_idxs[_n_flow]
         parameter = self.death_flows_dict["parameter"][_n_flow]
         parameter_value = self.get_parameter_value(parameter, time)
         return parameter_value * compartment_values[origin_idx]
@@ -482,14 +703,22 @@ class EpiModel:
 
         :parameters and return: see previous method apply_all_flow_types_to_odes
         """
-        for n_comp, compartment in enumerate(self.compartment_names):
-            death_rate = self.get_compartment_death_rate(compartment, time)
-            net_flow = death_rate * compartment_values[n_comp]
-            flow_rates[n_comp] -= net_flow
+        flow_rates = np.asarray(flow_rates, dtype=float)
+        get_compartment_death_rate = self.get_compartment_death_rate
+        death_rates = np.array(
+            [get_compartment_death_rate(compartment, time) for compartment in self.compartment_names],
+            dtype=float,
+        )
+        total_deaths = apply_death_flows(
+            flow_rates,
+            np.asarray(compartment_values, dtype=float),
+            death_rates,
+            self.all_compartment_idxs,
+        )
 
-            # Track deaths in case births need to replace deaths
-            if "total_deaths" in self.tracked_quantities:
-                self.tracked_quantities["total_deaths"] += net_flow
+        # Track deaths in case births need to replace deaths
+        if "total_deaths" in self.tracked_quantities:
+            self.tracked_quantities["total_deaths"] += total_deaths
         return flow_rates
 
     def get_compartment_death_rate(self, _compartment, time):
@@ -548,14 +777,28 @@ class EpiModel:
             the total infectious quantity, whether that be the number or proportion of infectious persons
             needs to return as one for flows that are not transmission dynamic infectiousness flows
         """
-        flow_type = self.transition_flows_dict["type"][n_flow]
-        if flow_type == Flow.INFECTION_DENSITY:
+        if n_flow in self.infection_density_flows:
             return self.infectious_populations
-        elif flow_type == Flow.INFECTION_FREQUENCY:
+        elif n_flow in self.infection_frequency_flows:
             return self.infectious_populations / self.infectious_denominators
         else:
             return 1.0
 
+    def find_linear_flow_multipliers(self):
+        """
+        find the infectious multipliers of all the flows in self.linear_flow_indices together, as for
+            find_infectious_multiplier
+
+        :return: np.ndarray
+            the infectious multiplier of each linear flow, which is one for flows that are not transmission flows
+        """
+        multipliers = np.ones(len(self.linear_flow_indices))
+        multipliers[self.linear_density_positions] = self.infectious_populations
+        multipliers[self.linear_frequency_positions] = (
+            self.infectious_populations / self.infectious_denominators
+        )
+        return multipliers
+
     def update_tracked_quantities(self, compartment_values):
         """
         Update quantities that emerge during model running (not pre-defined functions of time)
@@ -615,34 +858,113 @@ class EpiModel:
         find outputs based on connections of transition flows for each requested time point, rather than at the time
             points that the model integration steps occurred at, which are arbitrary and determined by the integration
             routine used
-        """
-        for output in self.output_connections:
-            self.derived_outputs[output] = [0.0] * len(self.times)
-            transition_indices = self.find_output_transition_indices(output)
-            for ntime, time in enumerate(self.times):
-                self.restore_past_state(time)
-                for n_flow in transition_indices:
-                    net_flow = self.find_net_transition_flow(n_flow, time, self.compartment_values)
-                    self.derived_outputs[output][ntime] += net_flow
+        the model state is restored once per time point to find the rates of all the flows contributing to any output,
+            then the rates are multiplied by their origin compartment sizes and summed into their outputs in one kernel
+        """
+        outputs = list(self.output_connections)
+        if not outputs:
+            return
+
+        # sort the flows for each output into customised flows and those proportional to their origin compartment
+        output_flow_indices = {
+            output: self.find_output_transition_indices(output) for output in outputs
+        }
+        custom_flow_indices = {
+            output: [
+                n_flow
+                for n_flow in output_flow_indices[output]
+                if self.transition_flows_dict["type"][n_flow] == Flow.CUSTOM
+            ]
+            for output in outputs
+        }
+        linear_flow_indices = sorted(
+            {
+                n_flow
+                for output in outputs
+                for n_flow in output_flow_indices[output]
+                if n_flow not in custom_flow_indices[output]
+            }
+        )
+
+        # one entry for each pairing of a flow (column of the rates) with an output it contributes to
+        flow_positions = {n_flow: i_flow for i_flow, n_flow in enumerate(linear_flow_indices)}
+        pair_flow_idxs, pair_output_idxs = [], []
+        for i_output, output in enumerate(outputs):
+            for n_flow in output_flow_indices[output]:
+                if n_flow in flow_positions:
+                    pair_flow_idxs.append(flow_positions[n_flow])
+                    pair_output_idxs.append(i_output)
+
+        flow_rates = np.zeros((len(self.times), len(linear_flow_indices)))
+        custom_net_flows = {output: np.zeros(len(self.times)) for output in outputs}
+        for ntime, time in enumerate(self.times):
+            self.restore_past_state(time)
+            flow_rates[ntime] = [
+                self.get_transition_flow_rate(n_flow, time) for n_flow in linear_flow_indices
+            ]
+            for output in outputs:
+                for n_flow in custom_flow_indices[output]:
+                    custom_net_flows[output][ntime] += self.find_net_transition_flow(
+                        n_flow, time, self.compartment_values
+                    )
+
+        output_values = accumulate_output_flows(
+            np.asarray(self.outputs, dtype=float),
+            flow_rates,
+            self.transition_origin_idxs[linear_flow_indices],
+            np.array(pair_flow_idxs, dtype=np.int64),
+            np.array(pair_output_idxs, dtype=np.int64),
+            len(outputs),
+        )
+        for i_output, output in enumerate(outputs):
+            self.derived_outputs[output] = list(output_values[:, i_output] + custom_net_flows[output])
 
-    def calculate_post_integration_death_outputs(self, death_output):
+    def calculate_post_integration_death_outputs(self):
         """
-        find outputs based on connections of transition flows for each requested time point, rather than at the time
-            points that the model integration steps occurred at, which are arbitrary and determined by the integration
-            routine used
+        find the infection-related death outputs for each requested category at each requested time point
+        the model state is restored once per time point to find the rates of all the death flows contributing to any
+            category, which are then summed into their categories in the same kernel as the connection outputs
         """
-        category_name = (
-            "infection_deathsXall"
-            if death_output == ()
-            else "infection_deathsX" + "X".join(death_output)
+        if not self.death_output_categories:
+            return
+
+        category_flow_indices = {}
+        for death_output in self.death_output_categories:
+            category_name = (
+                "infection_deathsXall"
+                if death_output == ()
+                else "infection_deathsX" + "X".join(death_output)
+            )
+            category_flow_indices[category_name] = self.find_output_death_indices(death_output)
+
+        death_flow_indices = sorted(
+            {n_flow for flow_indices in category_flow_indices.values() for n_flow in flow_indices}
         )
-        self.derived_outputs[category_name] = [0.0] * len(self.times)
-        death_indices = self.find_output_death_indices(death_output)
+        flow_positions = {n_flow: i_flow for i_flow, n_flow in enumerate(death_flow_indices)}
+        pair_flow_idxs, pair_category_idxs = [], []
+        for i_category, flow_indices in enumerate(category_flow_indices.values()):
+            for n_flow in flow_indices:
+                pair_flow_idxs.append(flow_positions[n_flow])
+                pair_category_idxs.append(i_category)
+
+        death_parameters = [self.death_flows_dict["parameter"][n_flow] for n_flow in death_flow_indices]
+        death_rates = np.zeros((len(self.times), len(death_flow_indices)))
         for ntime, time in enumerate(self.times):
             self.restore_past_state(time)
-            for n_flow in death_indices:
-                net_flow = self.find_net_infection_death_flow(n_flow, time, self.compartment_values)
-                self.derived_outputs[category_name][ntime] += net_flow
+            death_rates[ntime] = [
+                self.get_parameter_value(parameter, time) for parameter in death_parameters
+            ]
+
+        category_values = accumulate_output_flows(
+            np.asarray(self.outputs, dtype=float),
+            death_rates,
+            self.death_origin_idxs[death_flow_indices],
+            np.array(pair_flow_idxs, dtype=np.int64),
+            np.array(pair_category_idxs, dtype=np.int64),
+            len(category_flow_indices),
+        )
+        for i_category, category_name in enumerate(category_flow_indices):
+            self.derived_outputs[category_name] = list(category_values[:, i_category])
 
     def calculate_post_integration_function_outputs(self):
         """
@@ -665,7 +987,11 @@ class EpiModel:
         :param time: float
             time point to go back to
         """
-        self.compartment_values = self.outputs[self.times.index(time)]
+        # the times are sorted, so binary search for the time rather than scanning the list from the start
+        time_idx = bisect_left(self.times, time)
+        if time_idx == len(self.times) or self.times[time_idx] != time:
+            raise ValueError(f"{time} is not one of the model times")
+        self.compartment_values = self.outputs[time_idx]
         self.update_tracked_quantities(self.compartment_values)
 
     def find_output_transition_indices(self, output: str):
@@ -675,43 +1001,28 @@ class EpiModel:
         and something to to with "origin condition" or "to condition" which I don't understand.
         Returns a list of idxs for the transition flows DataFrame.
         """
-        num_flows = len(self.transition_flows)
-        flow_idxs = []
-        for flow_idx in range(num_flows):
-            output_conn = self.output_connections[output]
-            implement = self.transition_flows_dict["implement"][flow_idx]
-            origin = self.transition_flows_dict["origin"][flow_idx]
-            target = self.transition_flows_dict["to"][flow_idx]
-            check_origin_stem = find_stem(origin) == output_conn["origin"]
-            check_target_stem = find_stem(target) == output_conn["to"]
-            check_implement = implement == len(self.all_stratifications)
-            check_origin_condition = "origin_condition" not in output_conn or (
-                "origin_condition" in output_conn
-                and all(
-                    tag in find_name_components(origin)
-                    for tag in find_name_components(output_conn["origin_condition"])
-                )
-                or output_conn["origin_condition"] == ""
-            )
-            check_target_condition = "to_condition" not in output_conn or (
-                "to_condition" in output_conn
-                and all(
-                    tag in find_name_components(target)
-                    for tag in find_name_components(output_conn["to_condition"])
-                )
-                or output_conn["to_condition"] == ""
-            )
-            is_transition_flow_for_output = (
-                check_implement
-                and check_origin_stem
-                and check_target_stem
-                and check_origin_condition
-                and check_target_condition
-            )
-            if is_transition_flow_for_output:
-                flow_idxs.append(flow_idx)
-
-        return flow_idxs
+        output_conn = self.output_connections[output]
+        candidate_idxs = np.flatnonzero(
+            self.transition_implemented
+            & (self.transition_origin_stems == output_conn["origin"])
+            & (self.transition_target_stems == output_conn["to"])
+        )
+        origin_tags = (
+            set(find_name_components(output_conn["origin_condition"]))
+            if output_conn.get("origin_condition")
+            else set()
+        )
+        target_tags = (
+            set(find_name_components(output_conn["to_condition"]))
+            if output_conn.get("to_condition")
+            else set()
+        )
+        return [
+            int(flow_idx)
+            for flow_idx in candidate_idxs
+            if origin_tags <= self.transition_origin_components[flow_idx]
+            and target_tags <= self.transition_target_components[flow_idx]
+        ]
 
     def find_output_death_indices(self, _death_output):
         """
@@ -763,3 +1074,65 @@ class EpiModel:
             self.times, multiplier * self.get_total_compartment_size(compartment_tags)
         )
         matplotlib.pyplot.show()
+
+
+@jit(nopython=True, cache=True)
+def apply_linear_flows(
+    flow_rates: np.ndarray,
+    compartment_values: np.ndarray,
+    rates: np.ndarray,
+    origin_idxs: np.ndarray,
+    target_idxs: np.ndarray,
+):
+    """
+    Apply transition flows whose net flow is a per-capita rate multiplied by the size of the origin compartment,
+    updating the flow rates in place.
+    """
+    for i_flow in range(rates.shape[0]):
+        net_flow = rates[i_flow] * compartment_values[origin_idxs[i_flow]]
+        flow_rates[origin_idxs[i_flow]] -= net_flow
+        flow_rates[target_idxs[i_flow]] += net_flow
+
+
+@jit(nopython=True, cache=True)
+def apply_death_flows(
+    flow_rates: np.ndarray,
+    compartment_values: np.ndarray,
+    rates: np.ndarray,
+    origin_idxs: np.ndarray,
+) -> float:
+    """
+    Remove deaths at a per-capita rate from their origin compartments, updating the flow rates in place.
+    Returns the total number of deaths, in case births need to replace them.
+    """
+    total_deaths = 0.0
+    for i_flow in range(rates.shape[0]):
+        net_flow = rates[i_flow] * compartment_values[origin_idxs[i_flow]]
+        flow_rates[origin_idxs[i_flow]] -= net_flow
+        total_deaths += net_flow
+    return total_deaths
+
+
+@jit(nopython=True, cache=True)
+def accumulate_output_flows(
+    compartment_values: np.ndarray,
+    flow_rates: np.ndarray,
+    origin_idxs: np.ndarray,
+    pair_flow_idxs: np.ndarray,
+    pair_output_idxs: np.ndarray,
+    n_outputs: int,
+):
+    """
+    Sum the net flows contributing to each output at every time, where the net flow is the per-capita rate of the flow
+    multiplied by the size of its origin compartment.
+    Each (flow, output) pair adds the net flow of column pair_flow_idxs of the rates into column pair_output_idxs of
+    the returned (times, outputs) array.
+    """
+    output_values = np.zeros((flow_rates.shape[0], n_outputs))
+    for i_time in range(flow_rates.shape[0]):
+        for i_pair in range(pair_flow_idxs.shape[0]):
+            i_flow = pair_flow_idxs[i_pair]
+            output_values[i_time, pair_output_idxs[i_pair]] += (
+                flow_rates[i_time, i_flow] * compartment_values[i_time, origin_idxs[i_flow]]
+            )
+    return output_values
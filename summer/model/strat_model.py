@@ -1,10 +1,11 @@
 import copy
 import itertools
 from functools import lru_cache
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 import numpy as np
 import numpy
+import pandas as pd
 
 from summer.constants import (
     Compartment,
@@ -22,8 +23,6 @@ from .utils import (
     create_stratified_name,
     create_stratum_name,
     create_time_variant_multiplicative_function,
-    element_list_multiplication,
-    element_list_division,
     extract_reversed_x_positions,
     find_name_components,
     find_stem,
@@ -100,7 +99,7 @@ class StratifiedModel(EpiModel):
     :attribute overwrite_key: str
         standard string used by model to identify the dictionary element that represents the over-write parameters,
             rather than a request to a particular stratum
-    :attribute overwrite_parameters: list
+    :attribute overwrite_parameters: set
         parameters which will result in all the less stratified parameters closer to the stratification tree's trunk
             being ignored
     :attribute parameter_components: dict
@@ -111,7 +110,7 @@ class StratifiedModel(EpiModel):
         unprocessed parameters, which may be either float values or strings pointing to the keys of time_variants
     :attribute removed_compartments: list
         all unstratified compartments that have been removed through the stratification process
-    :attribute overwrite_parameters: list
+    :attribute overwrite_parameters: set
         any parameters that are intended as absolute values to be applied to that stratum and not multipliers for the
             unstratified parameter further up the tree
     :attribute strain_mixing_elements: dict
@@ -195,7 +194,7 @@ class StratifiedModel(EpiModel):
         )
         self.full_stratification_list = []
         self.removed_compartments = []
-        self.overwrite_parameters = []
+        self.overwrite_parameters = set()
         self.compartment_types_to_stratify = []
         self.strains = []
         self.mixing_categories = []
@@ -213,7 +212,11 @@ class StratifiedModel(EpiModel):
         self.infectious_populations = {}
         self.strain_mixing_elements = {}
         self.strain_mixing_multipliers = {}
+        self.strain_mixing_arrays = {}
+        self.infection_forces = {}
         self.strata_indices = {}
+        self.entry_fraction_names = {}
+        self.death_rate_names = {}
         self.target_props = {}
         self.cumulative_target_props = {}
         self.individual_infectiousness_adjustments = []
@@ -574,24 +577,29 @@ class StratifiedModel(EpiModel):
         Set inter-compartmental flows for ageing from one stratum to the next.
         The ageing rate is proportional to the width of the age bracket.
         """
-        ageing_flows = []
+        age_brackets = []
         for strata_idx in range(len(strata_names) - 1):
             start_age = int(strata_names[strata_idx])
             end_age = int(strata_names[strata_idx + 1])
             ageing_parameter_name = f"ageing{start_age}to{end_age}"
-            ageing_rate = 1.0 / (end_age - start_age)
-            self.parameters[ageing_parameter_name] = ageing_rate
-            for compartment in self.compartment_names:
-                ageing_flow = {
-                    "type": Flow.STANDARD,
-                    "parameter": ageing_parameter_name,
-                    "origin": create_stratified_name(compartment, "age", start_age),
-                    "to": create_stratified_name(compartment, "age", end_age),
-                    "implement": len(self.all_stratifications),
-                }
-                ageing_flows.append(ageing_flow)
-
-        self.transition_flows = self.transition_flows.append(ageing_flows)
+            self.parameters[ageing_parameter_name] = 1.0 / (end_age - start_age)
+            age_brackets.append((start_age, end_age, ageing_parameter_name))
+
+        implement = len(self.all_stratifications)
+        ageing_flows = [
+            {
+                "type": Flow.STANDARD,
+                "parameter": ageing_parameter_name,
+                "origin": create_stratified_name(compartment, "age", start_age),
+                "to": create_stratified_name(compartment, "age", end_age),
+                "implement": implement,
+            }
+            for (start_age, end_age, ageing_parameter_name), compartment in itertools.product(
+                age_brackets, self.compartment_names
+            )
+        ]
+
+        self.transition_flows = pd.concat([self.transition_flows, pd.DataFrame(ageing_flows)])
 
     def prepare_starting_proportions(self, _strata_names, _requested_proportions):
         """
@@ -650,21 +658,24 @@ class StratifiedModel(EpiModel):
 
         Only compartments specified in `self.compartment_types_to_stratify` will be stratified.
         """
-        # Find the existing compartments that need stratification
+        # Find the existing compartments that need stratification, along with their starting values
         compartments_to_stratify = [
-            c for c in self.compartment_names if find_stem(c) in compartments_to_stratify
+            (name, value)
+            for name, value in zip(self.compartment_names, self.compartment_values)
+            if find_stem(name) in compartments_to_stratify
         ]
-        for compartment in compartments_to_stratify:
-            # Add newm stratified compartment.
-            for stratum in strata_names:
-                name = create_stratified_name(compartment, stratification_name, stratum)
-                idx = self.compartment_names.index(compartment)
-                value = self.compartment_values[idx] * strata_proportions[stratum]
-                self.add_compartment(name, value)
-
-            # Remove the original compartment, since it has now been stratified.
+
+        # Remove the original compartments, since they are being stratified.
+        for compartment, _ in compartments_to_stratify:
             self.remove_compartment(compartment)
 
+        # Add new stratified compartments, in the same order as stratifying each compartment in turn.
+        for (compartment, value), stratum in itertools.product(
+            compartments_to_stratify, strata_names
+        ):
+            name = create_stratified_name(compartment, stratification_name, stratum)
+            self.add_compartment(name, value * strata_proportions[stratum])
+
     def stratify_transition_flows(
         self,
         stratification_name: str,
@@ -742,7 +753,9 @@ class StratifiedModel(EpiModel):
             all_new_flows += new_flows
 
         if all_new_flows:
-            self.transition_flows = self.transition_flows.append(all_new_flows, ignore_index=True)
+            self.transition_flows = pd.concat(
+                [self.transition_flows, pd.DataFrame(all_new_flows)], ignore_index=True
+            )
 
     def add_adjusted_parameter(
         self, _unadjusted_parameter, _stratification_name, _stratum, _adjustment_requests,
@@ -788,7 +801,7 @@ class StratifiedModel(EpiModel):
                 OVERWRITE_KEY in _adjustment_requests[relevant_adjustment_request]
                 and _stratum in _adjustment_requests[relevant_adjustment_request][OVERWRITE_KEY]
             ):
-                self.overwrite_parameters.append(parameter_adjustment_name)
+                self.overwrite_parameters.add(parameter_adjustment_name)
         return parameter_adjustment_name
 
     def find_relevant_adjustment_request(self, _adjustment_requests, _unadjusted_parameter):
@@ -956,6 +969,7 @@ class StratifiedModel(EpiModel):
         :param _adjustment_requests:
             see incorporate_alternative_overwrite_approach and check_parameter_adjustment_requests
         """
+        new_flows = []
         for n_flow in self.find_death_indices_to_implement(back_one=1):
 
             # if the compartment with an additional death flow is being stratified
@@ -972,8 +986,8 @@ class StratifiedModel(EpiModel):
                     if not parameter_name:
                         parameter_name = self.death_flows.parameter[n_flow]
 
-                    # add the stratified flow to the death flows data frame
-                    self.death_flows = self.death_flows.append(
+                    # collect the stratified flow for the death flows data frame
+                    new_flows.append(
                         {
                             "type": self.death_flows.type[n_flow],
                             "parameter": parameter_name,
@@ -981,15 +995,20 @@ class StratifiedModel(EpiModel):
                                 self.death_flows.origin[n_flow], _stratification_name, stratum,
                             ),
                             "implement": len(self.all_stratifications),
-                        },
-                        ignore_index=True,
+                        }
                     )
 
             # otherwise if not part of the stratification, accept the existing flow and increment the implement value
             else:
                 new_flow = self.death_flows.loc[n_flow, :].to_dict()
                 new_flow["implement"] += 1
-                self.death_flows = self.death_flows.append(new_flow, ignore_index=True)
+                new_flows.append(new_flow)
+
+        # extend the data frame once, rather than copying it for every new flow
+        if new_flows:
+            self.death_flows = pd.concat(
+                [self.death_flows, pd.DataFrame(new_flows)], ignore_index=True
+            )
 
     def stratify_universal_death_rate(
         self,
@@ -1060,7 +1079,7 @@ class StratifiedModel(EpiModel):
                     OVERWRITE_KEY in _adjustment_requests["universal_death_rate"]
                     and stratum in _adjustment_requests["universal_death_rate"][OVERWRITE_KEY]
                 ):
-                    self.overwrite_parameters.append(
+                    self.overwrite_parameters.add(
                         create_stratified_name(
                             "universal_death_rate", _stratification_name, stratum
                         )
@@ -1201,10 +1220,11 @@ class StratifiedModel(EpiModel):
             _restriction: str
                 name of previously implemented stratum that this equilibration flow applies to, if any, otherwise "all"
         """
+        new_flows = []
         for compartment in self.unstratified_compartment_names:
             if _restriction in find_name_components(compartment) or _restriction == "all":
                 for n_stratum in range(len(_strata_names[:-1])):
-                    self.transition_flows = self.transition_flows.append(
+                    new_flows.append(
                         {
                             "type": Flow.STRATA_CHANGE,
                             "parameter": _stratification_name
@@ -1222,10 +1242,14 @@ class StratifiedModel(EpiModel):
                             ),
                             "implement": len(self.all_stratifications),
                             "strain": float("nan"),
-                        },
-                        ignore_index=True,
+                        }
                     )
 
+        if new_flows:
+            self.transition_flows = pd.concat(
+                [self.transition_flows, pd.DataFrame(new_flows)], ignore_index=True
+            )
+
     """
     pre-integration methods
     """
@@ -1256,20 +1280,69 @@ class StratifiedModel(EpiModel):
             ]
 
         self.find_strata_indices()
+        self.find_entry_fraction_names()
+        self.find_death_rate_names()
         self.prepare_lookup_tables()
 
+    def prepare_lookup_tables(self):
+        """
+        extend the lookup tables of the unstratified model by grouping the transmission flows by strain and type of
+            transmission, so that each group's force of infection is found once and spread to all its flows
+        """
+        super().prepare_lookup_tables()
+        infection_flow_groups = {}
+        for position, n_flow in enumerate(self.linear_flow_indices):
+            is_density_flow = n_flow in self.infection_density_flows
+            if not is_density_flow and n_flow not in self.infection_frequency_flows:
+                continue
+            strain = self.transition_flows_dict["strain"][n_flow] if self.strains else "all_strains"
+            positions, force_indices = infection_flow_groups.setdefault(
+                (strain, is_density_flow), ([], [])
+            )
+            positions.append(position)
+            force_indices.append(self.transition_flows_dict["force_index"][n_flow])
+
+        # force indices are only assigned to flows when there is a mixing matrix
+        self.linear_infection_flow_groups = {
+            group: (
+                np.array(positions, dtype=int),
+                np.array(force_indices, dtype=int) if self.mixing_matrix is not None else None,
+            )
+            for group, (positions, force_indices) in infection_flow_groups.items()
+        }
+
     def find_strata_indices(self):
+        compartment_names = tuple(self.compartment_names)
         for stratif in self.all_stratifications:
             self.strata_indices[stratif] = {}
-            for i_stratum, stratum in enumerate(self.all_stratifications[stratif]):
-                self.strata_indices[stratif][stratum] = [
-                    i_comp
-                    for i_comp in range(len(self.compartment_names))
-                    if create_stratum_name(
-                        stratif, self.all_stratifications[stratif][i_stratum], joining_string="",
-                    )
-                    in find_name_components(self.compartment_names[i_comp])
-                ]
+            for stratum in self.all_stratifications[stratif]:
+                stratum_name = create_stratum_name(stratif, stratum, joining_string="")
+                self.strata_indices[stratif][stratum] = find_compartments_with_components(
+                    compartment_names, (stratum_name,)
+                )
+
+    def find_entry_fraction_names(self):
+        """
+        find the names of the entry fraction parameters that apply to each entry compartment, so that these names do
+            not need to be rebuilt at every integration time step
+        """
+        self.entry_fraction_names = {
+            i_comp: ["entry_fractionX" + stratum for stratum in find_name_components(compartment)[1:]]
+            for i_comp, compartment in enumerate(self.compartment_names)
+            if find_stem(compartment) == self.entry_compartment
+        }
+
+    def find_death_rate_names(self):
+        """
+        find the name of the universal death rate parameter that applies to each compartment, so that these names do
+            not need to be rebuilt at every integration time step
+        """
+        self.death_rate_names = {
+            compartment: "universal_death_rateX" + compartment
+            if len(self.all_stratifications) > 0
+            else "universal_death_rate"
+            for compartment in self.compartment_names
+        }
 
     def prepare_stratified_parameter_calculations(self):
         """
@@ -1281,11 +1354,9 @@ class StratifiedModel(EpiModel):
         # create list of all the parameters that we need to find the set of adjustment functions for
         parameters_to_adjust = []
 
-        transition_flow_indices = [
-            n_flow
-            for n_flow, flow in enumerate(self.transition_flows.type)
-            if "change" not in flow
-            and self.transition_flows.implement[n_flow] == len(self.all_stratifications)
+        transition_flow_indices = self.transition_flows.index[
+            ~self.transition_flows.type.str.contains("change")
+            & (self.transition_flows.implement == len(self.all_stratifications))
         ]
 
         for n_flow in transition_flow_indices:
@@ -1507,12 +1578,15 @@ class StratifiedModel(EpiModel):
         # find the indices for the compartments that are infectious across all strains
         self.infectious_indices["all_strains"] = self.find_all_infectious_indices()
 
-        # then find the infectious compartment for each strain separately
-        for strain in self.strains:
+        # then find the infectious compartment for each strain separately, building each strain's stratum name once
+        strain_stratum_pairs = [
+            (strain, create_stratum_name("strain", strain, joining_string=""))
+            for strain in self.strains
+        ]
+        for strain, strain_stratum in strain_stratum_pairs:
             self.infectious_indices[strain] = convert_boolean_list_to_indices(
                 [
-                    create_stratum_name("strain", strain, joining_string="")
-                    in find_name_components(comp)
+                    strain_stratum in find_name_components(comp)
                     and i_comp in self.infectious_indices["all_strains"]
                     for i_comp, comp in enumerate(self.compartment_names)
                 ]
@@ -1525,21 +1599,23 @@ class StratifiedModel(EpiModel):
         """
 
         # identify the indices of all the infection-related flows to be implemented
-        infection_flow_indices = [
-            n_flow
-            for n_flow, flow in enumerate(self.transition_flows.type)
-            if "infection" in flow
-            and self.transition_flows.implement[n_flow] == len(self.all_stratifications)
+        infection_flow_indices = self.transition_flows.index[
+            self.transition_flows.type.str.contains("infection")
+            & (self.transition_flows.implement == len(self.all_stratifications))
+        ]
+
+        # split each mixing category into its strata once, rather than for every flow
+        mixing_category_strata = [
+            (i_group, find_name_components(force_group))
+            for i_group, force_group in enumerate(self.mixing_categories)
         ]
 
         # loop through and find the index of the mixing matrix applicable to the flow, of which there should be only one
         for n_flow in infection_flow_indices:
             found = False
-            for i_group, force_group in enumerate(self.mixing_categories):
-                if all(
-                    stratum in find_name_components(self.transition_flows.origin[n_flow])
-                    for stratum in find_name_components(force_group)
-                ):
+            origin_components = set(find_name_components(self.transition_flows.origin[n_flow]))
+            for i_group, force_group_strata in mixing_category_strata:
+                if origin_components.issuperset(force_group_strata):
                     self.transition_flows.force_index[n_flow] = i_group
                     if found:
                         raise ValueError(
@@ -1560,17 +1636,11 @@ class StratifiedModel(EpiModel):
         if self.mixing_matrix is None:
             self.mixing_indices = {"all_population": range(len(self.compartment_names))}
         else:
+            compartment_names = tuple(self.compartment_names)
             for category in self.mixing_categories:
-                self.mixing_indices[category] = [
-                    i_comp
-                    for i_comp, compartment in enumerate(self.compartment_names)
-                    if all(
-                        [
-                            component in find_name_components(compartment)
-                            for component in find_name_components(category)
-                        ]
-                    )
-                ]
+                self.mixing_indices[category] = find_compartments_with_components(
+                    compartment_names, tuple(find_name_components(category))
+                )
 
         self.mixing_indices_arr = np.array(list(self.mixing_indices.values()))
 
@@ -1580,19 +1650,21 @@ class StratifiedModel(EpiModel):
             mixing category as a list of indices - and separately find multipliers as a list of the same length for
             their relative infectiousness extracted from self.infectiousness_multipliers
         """
+        mixing_categories = (
+            ["all_population"] if self.mixing_matrix is None else self.mixing_categories
+        )
         for strain in self.strains + ["all_strains"]:
             (self.strain_mixing_elements[strain], self.strain_mixing_multipliers[strain],) = (
                 {},
                 {},
             )
-            for category in (
-                ["all_population"] if self.mixing_matrix is None else self.mixing_categories
-            ):
+            strain_infectious_indices = set(self.infectious_indices[strain])
+            for category in mixing_categories:
                 self.strain_mixing_elements[strain][category] = numpy.array(
                     [
                         index
                         for index in self.mixing_indices[category]
-                        if index in self.infectious_indices[strain]
+                        if index in strain_infectious_indices
                     ]
                 )
                 self.strain_mixing_multipliers[strain][category] = numpy.array(
@@ -1602,6 +1674,16 @@ class StratifiedModel(EpiModel):
                     ]
                 )
 
+            # concatenate the categories' indices and multipliers, with offsets marking where each category starts
+            category_elements = list(self.strain_mixing_elements[strain].values())
+            self.strain_mixing_arrays[strain] = (
+                numpy.concatenate(category_elements).astype(int),
+                numpy.concatenate(list(self.strain_mixing_multipliers[strain].values())).astype(
+                    float
+                ),
+                numpy.cumsum([0] + [len(elements) for elements in category_elements]),
+            )
+
     def find_transition_indices_to_implement(
         self, back_one: int = 0, include_change: bool = False
     ) -> List[int]:
@@ -1618,12 +1700,12 @@ class StratifiedModel(EpiModel):
         :return: list
             list of indices of the flows that need to be stratified
         """
-        return [
-            idx
-            for idx, flow in self.transition_flows.iterrows()
-            if (flow.type != Flow.STRATA_CHANGE or include_change)
-            and flow.implement == len(self.all_stratifications) - back_one
-        ]
+        is_implemented = (
+            self.transition_flows.implement == len(self.all_stratifications) - back_one
+        )
+        if not include_change:
+            is_implemented &= self.transition_flows.type != Flow.STRATA_CHANGE
+        return self.transition_flows.index[is_implemented].tolist()
 
     def find_change_indices_to_implement(self, back_one=0):
         """
@@ -1633,12 +1715,10 @@ class StratifiedModel(EpiModel):
             back_one: int
              see find_transition_indices_to_implement
         """
-        return [
-            idx
-            for idx, flow in self.transition_flows.iterrows()
-            if flow.type == Flow.STRATA_CHANGE
-            and flow.implement == len(self.all_stratifications) - back_one
-        ]
+        is_implemented = (
+            self.transition_flows.implement == len(self.all_stratifications) - back_one
+        ) & (self.transition_flows.type == Flow.STRATA_CHANGE)
+        return self.transition_flows.index[is_implemented].tolist()
 
     def find_death_indices_to_implement(self, back_one=0):
         """
@@ -1685,20 +1765,41 @@ class StratifiedModel(EpiModel):
         :param compartment_values: numpy array
             current values for the compartment sizes
         """
-        strains = self.strains if self.strains else ["all_strains"]
-        if self.mixing_matrix is None:
-            mixing_categories = ["all_population"]
+        self.infectious_denominators = compartment_values[self.mixing_indices_arr].sum(axis=1)
+        if self.strains:
+            self.infectious_populations = find_infectious_populations(
+                compartment_values, self.strains, self.strain_mixing_arrays
+            )
         else:
-            mixing_categories = self.mixing_categories
+            # most models are not stratified by strain, so go straight to the single set of infectious populations
+            self.infectious_populations = {
+                "all_strains": _find_infectious_populations_weighted_sums(
+                    compartment_values, *self.strain_mixing_arrays["all_strains"]
+                )
+            }
+        self.infection_forces = {}
 
-        self.infectious_denominators = compartment_values[self.mixing_indices_arr].sum(axis=1)
-        self.infectious_populations = find_infectious_populations(
-            compartment_values,
-            strains,
-            mixing_categories,
-            self.strain_mixing_elements,
-            self.strain_mixing_multipliers,
+    def find_infection_forces(self, strain, is_density_flow):
+        """
+        find the force of infection for every mixing category from the current infectious populations, so that it is
+            calculated once per time step rather than once for each infection flow
+
+        :param strain: str
+            strain of the infectious populations, or "all_strains" if the model is not stratified by strain
+        :param is_density_flow: bool
+            whether transmission is density-dependent, otherwise the infectious populations are divided through by the
+                population of their mixing category
+        :return:
+            the force of infection applying to each mixing category, or the single total if there is no mixing matrix
+        """
+        infectious_populations = (
+            self.infectious_populations[strain]
+            if is_density_flow
+            else self.infectious_populations[strain] / self.infectious_denominators
         )
+        if self.mixing_matrix is None:
+            return infectious_populations.sum()
+        return self.mixing_matrix.dot(infectious_populations)
 
     def find_infectious_multiplier(self, n_flow):
         """
@@ -1710,28 +1811,36 @@ class StratifiedModel(EpiModel):
             the total infectious quantity, whether that is the number or proportion of infectious persons
             needs to return as one for flows that are not transmission dynamic infectiousness flows
         """
-        flow_type = self.transition_flows_dict["type"][n_flow]
-        strain = self.transition_flows_dict["strain"][n_flow]
-        force_index = self.transition_flows_dict["force_index"][n_flow]
-
-        if "infection" not in flow_type:
+        is_density_flow = n_flow in self.infection_density_flows
+        if not is_density_flow and n_flow not in self.infection_frequency_flows:
             return 1.0
-        strain = "all_strains" if not self.strains else strain
-        mixing_elements = (
-            [1.0] if self.mixing_matrix is None else self.mixing_matrix[force_index, :]
-        )
-        denominator = (
-            [1.0] * len(self.infectious_denominators)
-            if "_density" in flow_type
-            else self.infectious_denominators
-        )
 
-        return sum(
-            element_list_division(
-                element_list_multiplication(self.infectious_populations[strain], mixing_elements),
-                denominator,
-            )
-        )
+        strain = self.transition_flows_dict["strain"][n_flow] if self.strains else "all_strains"
+        forces = self.infection_forces.get((strain, is_density_flow))
+        if forces is None:
+            forces = self.find_infection_forces(strain, is_density_flow)
+            self.infection_forces[(strain, is_density_flow)] = forces
+
+        if self.mixing_matrix is None:
+            return forces
+        return forces[self.transition_flows_dict["force_index"][n_flow]]
+
+    def find_linear_flow_multipliers(self):
+        """
+        find the infectious multipliers of all the flows in self.linear_flow_indices together, as for
+            find_infectious_multiplier
+
+        :return: np.ndarray
+            the infectious multiplier of each linear flow, which is one for flows that are not transmission flows
+        """
+        multipliers = np.ones(len(self.linear_flow_indices))
+        for group, (positions, force_indices) in self.linear_infection_flow_groups.items():
+            forces = self.infection_forces.get(group)
+            if forces is None:
+                forces = self.find_infection_forces(*group)
+                self.infection_forces[group] = forces
+            multipliers[positions] = forces if self.mixing_matrix is None else forces[force_indices]
+        return multipliers
 
     def prepare_time_step(self, _time):
         """
@@ -1739,6 +1848,7 @@ class StratifiedModel(EpiModel):
         """
         if self.dynamic_mixing_matrix:
             self.mixing_matrix = self.find_dynamic_mixing_matrix(_time)
+            self.infection_forces = {}
 
     def find_dynamic_mixing_matrix(self, _time):
         """
@@ -1757,11 +1867,7 @@ class StratifiedModel(EpiModel):
         :return: float
             death rate
         """
-        return (
-            self.get_parameter_value("universal_death_rateX" + _compartment, _time)
-            if len(self.all_stratifications) > 0
-            else self.get_parameter_value("universal_death_rate", _time)
-        )
+        return self.get_parameter_value(self.death_rate_names[_compartment], _time)
 
     def apply_birth_rate(self, _ode_equations, _compartment_values, _time):
         """
@@ -1776,22 +1882,16 @@ class StratifiedModel(EpiModel):
         total_births = self.find_total_births(_compartment_values, _time)
 
         # split the total births across entry compartments
-        for compartment in [
-            comp for comp in self.compartment_names if find_stem(comp) == self.entry_compartment
-        ]:
+        for i_comp, entry_fraction_names in self.entry_fraction_names.items():
 
             # calculate adjustment to original stem entry rate
             entry_fraction = 1.0
-            for stratum in find_name_components(compartment)[1:]:
-                entry_fraction *= self.get_single_parameter_component(
-                    "entry_fractionX%s" % stratum, _time
-                )
+            for entry_fraction_name in entry_fraction_names:
+                entry_fraction *= self.get_single_parameter_component(entry_fraction_name, _time)
 
             # apply to that compartment
             _ode_equations = increment_list_by_index(
-                _ode_equations,
-                self.compartment_names.index(compartment),
-                total_births * entry_fraction,
+                _ode_equations, i_comp, total_births * entry_fraction
             )
         return _ode_equations
 
@@ -1942,32 +2042,62 @@ class StratifiedModel(EpiModel):
 from numba import jit
 
 
+# Cache results because calibration rebuilds models with the same structure 1000s of times.
+@lru_cache(maxsize=None)
+def _find_compartments_with_components(compartment_names: tuple, components: tuple) -> tuple:
+    return tuple(
+        i_comp
+        for i_comp, compartment in enumerate(compartment_names)
+        if all(component in find_name_components(compartment) for component in components)
+    )
+
+
+def find_compartments_with_components(compartment_names: tuple, components: tuple) -> List[int]:
+    """
+    find the indices of the compartments whose names include all of the requested name components
+    the cached indices are shared between models, so each model gets its own copy of the list
+
+    :param compartment_names: tuple
+        names of all the model compartments
+    :param components: tuple
+        the name components (stratum names or compartment stems) that the compartment name must include
+    :return: list
+        indices of the matching compartments
+    """
+    return list(_find_compartments_with_components(compartment_names, components))
+
+
 def find_infectious_populations(
     compartment_values: np.ndarray,
     strains: List[str],
-    mixing_categories: List[str],
-    strain_mixing_elements: Dict[str, Dict[str, List[int]]],
-    strain_mixing_multipliers: Dict[str, Dict[str, np.ndarray]],
+    strain_mixing_arrays: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]],
 ):
-    infectious_populations = {}
-    num_mixing_categories = len(mixing_categories)
-    for strain in strains:
-        infectious_populations[strain] = []
-        for idx in range(num_mixing_categories):
-            category = mixing_categories[idx]
-            weighted_sum = _find_infectious_populations_weighted_sum(
-                compartment_values,
-                strain_mixing_elements[strain][category],
-                strain_mixing_multipliers[strain][category],
-            )
-            infectious_populations[strain].append(weighted_sum)
-
-    return infectious_populations
+    return {
+        strain: _find_infectious_populations_weighted_sums(
+            compartment_values, *strain_mixing_arrays[strain]
+        )
+        for strain in strains
+    }
 
 
-@jit(nopython=True)
-def _find_infectious_populations_weighted_sum(
-    compartment_values: np.ndarray, mixing_element_idxs: np.ndarray, mixing_multipliers: np.ndarray,
+@jit(nopython=True, cache=True)
+def _find_infectious_populations_weighted_sums(
+    compartment_values: np.ndarray,
+    mixing_element_idxs: np.ndarray,
+    mixing_multipliers: np.ndarray,
+    category_offsets: np.ndarray,
 ):
-    mixing_elements = compartment_values[mixing_element_idxs]
-    return (mixing_elements * mixing_multipliers).sum()
+    """
+    find the infectiousness-weighted infectious population of each mixing category in a single compiled pass
+    """
+    num_categories = category_offsets.shape[0] - 1
+    weighted_sums = np.zeros(num_categories)
+    for i_category in range(num_categories):
+        weighted_sum = 0.0
+        for i_element in range(category_offsets[i_category], category_offsets[i_category + 1]):
+            weighted_sum += (
+                compartment_values[mixing_element_idxs[i_element]] * mixing_multipliers[i_element]
+            )
+        weighted_sums[i_category] = weighted_sum
+
+    return weighted_sums
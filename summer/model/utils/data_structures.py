@@ -30,7 +30,8 @@ def normalise_dict(value_dict):
     :return: dict
         same dictionary after values have been normalised to the total of the original values
     """
-    return {key: value_dict[key] / sum(value_dict.values()) for key in value_dict}
+    total = sum(value_dict.values())
+    return {key: value_dict[key] / total for key in value_dict}
 
 
 def order_dict_by_keys(input_dict):
@@ -6,9 +6,16 @@ from typing import List, Callable, Dict
 import numpy as np
 from scipy.integrate import odeint, solve_ivp
 from scipy.interpolate import interp1d
+from scipy.sparse import issparse
 
 from summer.constants import IntegrationType
 
+# solve_ivp methods that make use of a Jacobian
+IMPLICIT_IVP_METHODS = ["Radau", "BDF", "LSODA"]
+
+# solve_ivp methods that can factorise a sparse Jacobian directly, the others need a dense array
+SPARSE_JACOBIAN_IVP_METHODS = ["Radau", "BDF"]
+
 
 def solve_ode(
     solver_type: str,
@@ -16,11 +23,12 @@ def solve_ode(
     values: List[float],
     times: List[float],
     solver_args: Dict,
+    jac_func: Callable = None,
 ):
     if solver_type == IntegrationType.ODE_INT:
-        return solve_with_odeint(ode_func, values, times, solver_args)
+        return solve_with_odeint(ode_func, values, times, solver_args, jac_func)
     elif solver_type == IntegrationType.SOLVE_IVP:
-        return solve_with_ivp(ode_func, values, times, solver_args)
+        return solve_with_ivp(ode_func, values, times, solver_args, jac_func)
     elif solver_type == IntegrationType.EULER:
         return solve_with_euler(ode_func, values, times, solver_args)
     elif solver_type == IntegrationType.RUNGE_KUTTA:
@@ -30,24 +38,57 @@ def solve_ode(
 
 
 def solve_with_odeint(
-    ode_func: Callable, values: List[float], times: List[float], solver_args: Dict
+    ode_func: Callable,
+    values: List[float],
+    times: List[float],
+    solver_args: Dict,
+    jac_func: Callable = None,
 ):
     """
     Solve ODE with SciPy's odeint
     https://docs.scipy.org/doc/scipy/reference/generated/scipy.integrate.odeint.html
+    The Jacobian function, if supplied, is used by LSODA's stiff method in place of finite difference estimates, and
+    must be converted to a dense array.
     """
     atol = solver_args.get("atol", 1e-3)
     rtol = solver_args.get("rtol", 1e-3)
-    return odeint(ode_func, values, times, atol=atol, rtol=rtol)
+    dfun = None
+    if jac_func:
+
+        def dfun(values, time):
+            jacobian = jac_func(values, time)
+            return jacobian.toarray() if issparse(jacobian) else jacobian
 
+    return odeint(ode_func, values, times, Dfun=dfun, atol=atol, rtol=rtol)
 
-def solve_with_ivp(ode_func: Callable, values: List[float], times: List[float], solver_args: Dict):
+
+def solve_with_ivp(
+    ode_func: Callable,
+    values: List[float],
+    times: List[float],
+    solver_args: Dict,
+    jac_func: Callable = None,
+):
     """
     Solve ODE with SciPy's solve_ivp.
     https://docs.scipy.org/doc/scipy/reference/generated/scipy.integrate.solve_ivp.html#scipy.integrate.solve_ivp
     This method allows us to set a stopping condition.
+    The Jacobian function, if supplied, is only passed on to the implicit methods, which are the ones that use it.
+    A sparse Jacobian is kept sparse for the methods that support it and converted to a dense array for the others.
     """
     stopping_tolerance = solver_args.get("stopping_tolerance", 1e-60)
+    method = solver_args.get("method", "RK45")
+    ivp_kwargs = {}
+    if jac_func and method in IMPLICIT_IVP_METHODS:
+
+        def _jac_func(time, values):
+            """Reverse parameters"""
+            jacobian = jac_func(values, time)
+            if issparse(jacobian) and method not in SPARSE_JACOBIAN_IVP_METHODS:
+                return jacobian.toarray()
+            return jacobian
+
+        ivp_kwargs["jac"] = _jac_func
 
     def _ode_func(time, values):
         """Reverse parameters"""
@@ -59,7 +100,15 @@ def solve_with_ivp(ode_func: Callable, values: List[float], times: List[float],
 
     _get_stopping_conditions.terminal = True
     t_span = (times[0], times[-1])
-    results = solve_ivp(_ode_func, t_span, values, t_eval=times, events=_get_stopping_conditions)
+    results = solve_ivp(
+        _ode_func,
+        t_span,
+        values,
+        method=method,
+        t_eval=times,
+        events=_get_stopping_conditions,
+        **ivp_kwargs,
+    )
     return results["y"].transpose()
 
 
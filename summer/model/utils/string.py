@@ -1,6 +1,7 @@
 """
 String manipulation functions
 """
+import sys
 from functools import lru_cache
 
 
@@ -18,7 +19,7 @@ def create_stratum_name(stratification_name, stratum_name, joining_string="X"):
     :return: str
         the composite string for the stratification
     """
-    return joining_string + "%s_%s" % (stratification_name, str(stratum_name))
+    return "".join((joining_string, stratification_name, "_", str(stratum_name)))
 
 
 def create_stratified_name(stem, stratification_name, stratum_name):
@@ -33,8 +34,9 @@ def create_stratified_name(stem, stratification_name, stratum_name):
         name of the stratum within the stratification
     :return: str
         the composite name with the standardised stratification name added on to the old stem
+        names are interned, because they are used as dictionary keys throughout model construction and integration
     """
-    return stem + create_stratum_name(stratification_name, stratum_name)
+    return sys.intern("".join((stem, "X", stratification_name, "_", str(stratum_name))))
 
 
 def extract_x_positions(parameter, joining_string="X"):
@@ -87,15 +89,7 @@ def find_name_components(compartment):
     :return: list
         the extracted compartment components
     """
-
-    # add -1 at the start, which becomes zero to represent the start when one is added
-    x_positions = [-1] + extract_x_positions(compartment)
-
-    # add one to the first index to go past the joining character, but not at the end
-    return [
-        compartment[x_positions[x_pos] + 1 : x_positions[x_pos + 1]]
-        for x_pos in range(len(x_positions) - 1)
-    ]
+    return compartment.split("X")
 
 
 def find_stratum_index_from_string(compartment, stratification, remove_stratification_name=True):
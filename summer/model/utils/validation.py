@@ -19,7 +19,8 @@ def validate_model(model):
     """
     schema = get_model_schema(model)
     validator = Validator(schema, allow_unknown=True, require_all=True)
-    model_data = model.__dict__
+    # Only pass on the attributes in the schema, so the validator does not copy and walk the rest of the model.
+    model_data = {key: value for key, value in model.__dict__.items() if key in schema}
     is_valid = validator.validate(model_data)
     if not is_valid:
         errors = validator.errors
@@ -44,11 +45,7 @@ def get_model_schema(model):
                 BirthApproach.NO_BIRTH,
             ],
         },
-        "times": {
-            "type": "list",
-            "schema": {"anyof_type": ["integer", "float"]},
-            "check_with": check_times,
-        },
+        "times": {"type": "list", "check_with": check_times},
         "compartment_types": {"type": "list", "schema": {"type": "string"}},
         "infectious_compartment": {
             "type": "list",
@@ -160,9 +157,12 @@ def check_initial_conditions(model):
 
 def check_times(field, value, error):
     """
-    Ensure times are sorted in ascending order.
+    Ensure times are numbers sorted in ascending order.
+    Checked in a single pass, rather than with a per-element schema rule, because there can be many times.
     """
-    if sorted(value) != value:
+    if not all(isinstance(time, (int, float)) for time in value):
+        error(field, "Integration times must be numbers")
+    elif sorted(value) != value:
         error(field, "Integration times are not in order")
 
 
@@ -22,8 +22,7 @@ class RunFullModels(luigi.Task):
     def requires(self):
         # Get number of uploaded dbs
         key_prefix = os.path.join(self.run_id, "data/calibration_outputs")
-        chain_db_keys = utils.list_s3(key_prefix, key_suffix=".db")
-        chain_db_idxs = [int(k.replace(".db", "").split("_")[-1]) for k in chain_db_keys]
+        chain_db_idxs = utils.list_chain_ids(key_prefix)
         return [UploadDatabaseTask(run_id=self.run_id, chain_id=i) for i in chain_db_idxs]
 
 
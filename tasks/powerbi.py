@@ -138,8 +138,7 @@ class CollationTask(utils.BaseTask):
 
     def requires(self):
         key_prefix = os.path.join(self.run_id, "data/full_model_runs")
-        chain_db_keys = utils.list_s3(key_prefix, key_suffix=".db")
-        chain_db_idxs = [int(k.replace(".db", "").split("_")[-1]) for k in chain_db_keys]
+        chain_db_idxs = utils.list_chain_ids(key_prefix)
         return [PruneFullRunDatabaseTask(run_id=self.run_id, chain_id=i) for i in chain_db_idxs]
 
     def output(self):
@@ -2,13 +2,14 @@ import os
 import glob
 import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 import boto3
 import luigi
 import sentry_sdk
 from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ProfileNotFound
-from luigi.contrib.s3 import S3Target
+from luigi.contrib.s3 import S3Client, S3Target
 
 
 from . import settings
@@ -49,6 +50,10 @@ else:
 
 s3 = session.client("s3")
 
+# Each S3Target builds its own luigi S3 client, and boto3 resource, unless given one, so all targets share this
+# client when luigi checks whether upload tasks are complete
+s3_target_client = S3Client()
+
 
 def get_calibration_db_filename(chain_id: int):
     return f"outputs_calibration_chain_{chain_id}.db"
@@ -208,7 +213,7 @@ class UploadS3Task(BaseTask, ABC):
     run_id = luigi.Parameter()  # Unique run id string
 
     def output(self):
-        return S3Target(self.get_s3_uri())
+        return S3Target(self.get_s3_uri(), client=s3_target_client)
 
     def safe_run(self):
         upload_s3(self.get_src_path(), self.get_dest_key())
@@ -243,6 +248,15 @@ def list_s3(key_prefix: str, key_suffix: str):
     return [o["Key"] for o in objs if o["Key"].endswith(key_suffix)]
 
 
+# A run's chain databases are all uploaded before the tasks that read them are scheduled, and luigi calls
+# requires() many times while building and checking the task graph, so each S3 path is only listed once
+@lru_cache(maxsize=None)
+def list_chain_ids(key_prefix: str):
+    """Returns the chain ids of the databases uploaded to a path in AWS S3"""
+    chain_db_keys = list_s3(key_prefix, key_suffix=".db")
+    return tuple(int(k.replace(".db", "").split("_")[-1]) for k in chain_db_keys)
+
+
 def download_s3(src_key, dest_path):
     """Downloads a file from AWS S3"""
     logger.info("Downloading from %s to %s", src_key, dest_path)
@@ -1,10 +1,20 @@
+import math
 import os
 from copy import deepcopy
 
+import numpy as np
 import pytest
+from scipy import stats
 from autumn.db import Database
 from autumn.calibration import Calibration, CalibrationMode
-from autumn.calibration.utils import sample_starting_params_from_lhs, specify_missing_prior_params
+from autumn.calibration.utils import (
+    calculate_prior,
+    calculate_prior_pdfs,
+    get_log_prior_arrays,
+    sample_starting_params_from_lhs,
+    specify_missing_prior_params,
+    sum_log_priors,
+)
 
 from .utils import get_mock_model
 
@@ -104,6 +114,48 @@ def _prepare_params(l):
     return set([tuple(sorted(ps.items())) for ps in l])
 
 
+LOG_PRIOR_TEST_CASES = [
+    ["uniform", [1.0, 3.0], lambda x: math.log(1.0 / 2.0)],
+    ["lognormal", [0.3, 0.7], lambda x: stats.lognorm.logpdf(x=x, s=0.7, scale=math.exp(0.3))],
+    ["beta", [2.0, 5.0], lambda x: stats.beta.logpdf(x, 2.0, 5.0)],
+    ["gamma", [2.5, 0.4], lambda x: stats.gamma.logpdf(x, 2.5, 0.0, 0.4)],
+]
+
+
+@pytest.mark.parametrize("distribution,distri_params,scipy_log_pdf", LOG_PRIOR_TEST_CASES)
+def test_calculate_prior__with_log__expect_scipy_log_pdf(distribution, distri_params, scipy_log_pdf):
+    prior_dict = {"distribution": distribution, "distri_params": distri_params}
+    for x in [-1.0, 0.0, 0.001, 0.2, 0.5, 0.99, 1.0, 2.0]:
+        log_prior = calculate_prior(prior_dict, x, log=True)
+        expected = float(scipy_log_pdf(x))
+        assert log_prior == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("distribution,distri_params,scipy_log_pdf", LOG_PRIOR_TEST_CASES)
+def test_calculate_prior_pdfs__expect_scipy_pdf(distribution, distri_params, scipy_log_pdf):
+    prior_dict = {"distribution": distribution, "distri_params": distri_params}
+    x_values = np.linspace(0.05, 0.95, 10)
+    expected = [math.exp(scipy_log_pdf(x)) for x in x_values]
+    assert np.allclose(calculate_prior_pdfs(prior_dict, x_values), expected)
+
+
+def test_sum_log_priors__expect_sum_of_individual_log_priors():
+    priors = [
+        {"param_name": name, "distribution": distribution, "distri_params": distri_params}
+        for name, (distribution, distri_params, _) in zip("abcd", LOG_PRIOR_TEST_CASES)
+    ]
+    param_values = [2.5, 1.2, 0.3, 0.8]
+    param_names = ["d", "b", "c", "a"]
+    distribution_codes, distri_params = get_log_prior_arrays(priors, param_names)
+    log_prior = sum_log_priors(np.array(param_values), distribution_codes, distri_params)
+    priors_by_name = {prior_dict["param_name"]: prior_dict for prior_dict in priors}
+    expected = sum(
+        calculate_prior(priors_by_name[name], value, log=True)
+        for name, value in zip(param_names, param_values)
+    )
+    assert log_prior == pytest.approx(expected)
+
+
 def test_calibrate_autumn_mcmc(temp_data_dir):
     # Import autumn stuff inside function so we can mock out the database.
     priors = [
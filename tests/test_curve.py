@@ -0,0 +1,13 @@
+import numpy as np
+
+from autumn.curve import make_sigmoidal_curve
+
+
+def test_make_sigmoidal_curve__with_array_input__expect_same_values_as_scalar_input():
+    """
+    Ensure evaluating a sigmoidal curve over an array gives the same values as evaluating each time separately.
+    """
+    curve = make_sigmoidal_curve(y_low=0.2, y_high=0.9, x_start=1990, x_inflect=2000, multiplier=2)
+    times = np.linspace(1950.0, 2050.0, 201)
+    expected_values = [curve(time) for time in times]
+    assert np.allclose(curve(times), expected_values)
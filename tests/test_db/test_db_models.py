@@ -3,7 +3,7 @@ import os
 import pytest
 import numpy as np
 import pandas as pd
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 
 from ..utils import get_mock_model
 
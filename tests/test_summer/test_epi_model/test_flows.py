@@ -1,9 +1,11 @@
 """
 Ensure that the EpiModel model produces the correct flow rates and outputs when run.
 """
+import numpy as np
 import pytest
 
 from summer.model import EpiModel
+from summer.model.epi_model import accumulate_output_flows, apply_death_flows
 from summer.constants import (
     Compartment,
     Flow,
@@ -103,7 +105,7 @@ def test_apply_transition_flows(flows, params, flow_rates, expected_new_rates):
     model.prepare_to_run()
     model.update_tracked_quantities(model.compartment_values)
     new_rates = model.apply_transition_flows(flow_rates, model.compartment_values, 2000)
-    assert new_rates == expected_new_rates
+    assert new_rates.tolist() == expected_new_rates
 
 
 PARAM_VARS = "flows,params,flow_rates,expected_new_rates,expect_deaths"
@@ -157,7 +159,7 @@ def test_apply_compartment_death_flows(
     model = EpiModel(**model_kwargs)
     model.prepare_to_run()
     new_rates = model.apply_compartment_death_flows(flow_rates, model.compartment_values, 2000)
-    assert new_rates == expected_new_rates
+    assert new_rates.tolist() == expected_new_rates
     assert model.tracked_quantities["total_deaths"] == expect_deaths
 
 
@@ -185,7 +187,7 @@ def test_epi_model_apply_universal_death_flow(
     model = EpiModel(**model_kwargs)
     model.prepare_to_run()
     new_rates = model.apply_universal_death_flow(flow_rates, model.compartment_values, 2000)
-    assert new_rates == expected_new_rates
+    assert new_rates.tolist() == expected_new_rates
     assert model.tracked_quantities["total_deaths"] == expect_deaths
 
 
@@ -263,3 +265,88 @@ def test_epi_model_apply_birth_rate__with_replace_deaths__expect_births(
     model.tracked_quantities["total_deaths"] = total_deaths
     new_rates = model.apply_birth_rate(flow_rates, model.compartment_values, 2000)
     assert new_rates == expected_new_rates
+
+
+@pytest.mark.parametrize("birth_approach", [BirthApproach.REPLACE_DEATHS, BirthApproach.ADD_CRUDE])
+def test_get_flow_jacobian__with_linear_flows__expect_finite_difference_match(birth_approach):
+    """
+    Ensure the analytic Jacobian matches a finite difference approximation when all flows are linear.
+    """
+    flows = [
+        {
+            "type": Flow.STANDARD,
+            "parameter": "recover_rate",
+            "origin": Compartment.EARLY_INFECTIOUS,
+            "to": Compartment.SUSCEPTIBLE,
+        },
+        {
+            "type": Flow.COMPARTMENT_DEATH,
+            "parameter": "infect_death",
+            "origin": Compartment.EARLY_INFECTIOUS,
+        },
+    ]
+    model_kwargs = {
+        **MODEL_KWARGS,
+        "parameters": {
+            "recover_rate": 0.3,
+            "infect_death": 0.5,
+            "universal_death_rate": 0.02,
+            "crude_birth_rate": 0.03,
+        },
+        "requested_flows": flows,
+        "birth_approach": birth_approach,
+    }
+    model = EpiModel(**model_kwargs)
+    model.prepare_to_run()
+    values = np.array(model.compartment_values, dtype=float)
+
+    def ode_func(compartment_values):
+        model.update_tracked_quantities(compartment_values)
+        return model.apply_all_flow_types_to_odes(compartment_values, 2000)
+
+    step = 1e-3
+    expected_jacobian = np.zeros((len(values), len(values)))
+    for i_comp in range(len(values)):
+        shift = np.zeros(len(values))
+        shift[i_comp] = step
+        expected_jacobian[:, i_comp] = (ode_func(values + shift) - ode_func(values - shift)) / (
+            2.0 * step
+        )
+
+    jacobian = model.get_flow_jacobian(values, 2000)
+    assert np.allclose(jacobian.toarray(), expected_jacobian)
+
+
+def test_accumulate_output_flows__expect_net_flows_summed_into_outputs():
+    """
+    Ensure each output is the sum over its flows of the flow rate multiplied by the origin compartment size.
+    """
+    compartment_values = np.array([[10.0, 20.0, 30.0], [1.0, 2.0, 3.0]])
+    flow_rates = np.array([[0.1, 0.2], [0.3, 0.4]])
+    origin_idxs = np.array([0, 2])
+    # First output gets both flows, second output only the second flow.
+    pair_flow_idxs = np.array([0, 1, 1])
+    pair_output_idxs = np.array([0, 0, 1])
+    output_values = accumulate_output_flows(
+        compartment_values, flow_rates, origin_idxs, pair_flow_idxs, pair_output_idxs, 2
+    )
+    assert np.allclose(output_values, [[7.0, 6.0], [1.5, 1.2]])
+
+
+def test_apply_death_flows__expect_deaths_removed_from_origins_and_totalled():
+    """
+    Ensure the death kernel removes each death flow from its origin compartment and returns the total deaths, matching
+    the uncompiled Python implementation.
+    """
+    compartment_values = np.array([10.0, 20.0, 30.0])
+    rates = np.array([0.1, 0.2, 0.5])
+    origin_idxs = np.array([0, 2, 2])
+    flow_rates = np.array([1.0, 2.0, 3.0])
+    total_deaths = apply_death_flows(flow_rates, compartment_values, rates, origin_idxs)
+    assert np.allclose(flow_rates, [0.0, 2.0, -18.0])
+    assert np.isclose(total_deaths, 22.0)
+
+    py_flow_rates = np.array([1.0, 2.0, 3.0])
+    py_total_deaths = apply_death_flows.py_func(py_flow_rates, compartment_values, rates, origin_idxs)
+    assert np.array_equal(flow_rates, py_flow_rates)
+    assert total_deaths == py_total_deaths
@@ -7,7 +7,7 @@ from copy import deepcopy
 import pytest
 import numpy as np
 import pandas as pd
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 
 from summer.model.utils.validation import ValidationException
 from summer.model import EpiModel, StratifiedModel
@@ -212,6 +212,8 @@ bad_inputs = [
     {"birth_approach": "not_a_valid_approach"},
     # Times out of order (seems kind of arbitrary?)
     {"times": [2, 34, 5, 1]},
+    # Times are not all numbers
+    {"times": [2000, 2001, "2002"]},
     # Output connections has wrong keys
     {"output_connections": {"foo": {"bar": 1}}},
     # Initial condition compartment not in compartment types
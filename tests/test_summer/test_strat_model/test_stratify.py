@@ -3,7 +3,7 @@ Test the results of stratifying a model.
 """
 import pytest
 import pandas as pd
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 
 from summer.model import StratifiedModel
 from summer.constants import (
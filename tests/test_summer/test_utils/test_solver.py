@@ -1,6 +1,6 @@
 import numpy as np
 
-from summer.model.utils.solver import solve_with_euler, solve_with_rk4
+from summer.model.utils.solver import solve_with_euler, solve_with_ivp, solve_with_rk4
 
 
 def test_solve_with_rk4_linear_func():
@@ -127,3 +127,28 @@ def test_solve_with_euler_quadratic_func():
     tolerance = 0.1
     equals_arr = np.array(expected_outputs) - output_arr < tolerance
     assert equals_arr.all()
+
+
+def test_solve_with_ivp__with_implicit_method_and_jacobian__expect_exponential_decay():
+    """
+    Ensure an implicit solve_ivp method uses the supplied Jacobian and solves a linear decay ODE.
+
+    y = exp(-t)
+    dy/dt = -y
+    """
+    jac_calls = []
+
+    def ode_func(vals, time):
+        return -vals
+
+    def jac_func(vals, time):
+        jac_calls.append(time)
+        return np.array([[-1.0]])
+
+    values = np.array([1.0])
+    times = np.array([0.0, 1.0, 2.0])
+    output_arr = solve_with_ivp(
+        ode_func, values, times, solver_args={"method": "BDF"}, jac_func=jac_func
+    )
+    assert jac_calls
+    assert np.allclose(output_arr[:, 0], np.exp(-times), rtol=1e-2)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from autumn.tool_kit.economics import get_cost_from_coverage, get_coverage_from_cost
+
+
+def test_get_cost_from_coverage__with_array_input__expect_logistic_curve_costs():
+    """
+    Ensure finding the costs of a series of coverages gives the costs of the logistic cost-coverage curve,
+    including the coverages with no cost and the coverage at saturation.
+    """
+    coverages = np.array([0.0, 0.1, 0.3, 0.5, 0.8, 0.9])
+    popsizes = np.array([1e5, 1e5, 0.0, 2e5, 2e5, 2e5])
+    costs = get_cost_from_coverage(coverages, 0.9, 10.0, popsizes, inflection_cost=1e4)
+    expected_costs = [0.0, 110414.598091, 0.0, 1137486.671646, 2559892.009651, 12972967.000574]
+    assert np.allclose(costs, expected_costs)
+    assert costs[0] == costs[2] == 0.0
+    assert np.isclose(get_cost_from_coverage(0.5, 0.9, 10.0, 2e5, inflection_cost=1e4), expected_costs[3])
+
+
+def test_get_coverage_from_cost__with_array_input__expect_inverse_of_cost():
+    """
+    Ensure the coverages found from an array of spendings recover the coverages those spendings were found from.
+    """
+    coverages = np.array([0.1, 0.3, 0.5, 0.8])
+    costs = get_cost_from_coverage(coverages, 0.9, 10.0, 1e5)
+    assert np.allclose(get_coverage_from_cost(costs, 0.9, 10.0, 1e5), coverages)
+    assert get_coverage_from_cost(0.0, 0.9, 10.0, 1e5) == 0.0